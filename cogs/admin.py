@@ -0,0 +1,31 @@
+# cogs/admin.py
+
+from discord.ext import commands
+from core.outbox import BACKGROUND, INTERACTIVE, NORMAL
+
+
+# 봇 운영 상태를 확인하는 관리자용 명령어 (플레이어 데이터와 무관한 것)
+class AdminCog(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self.outbox = bot.outbox
+
+    @commands.command(name="발송현황")
+    @commands.is_owner()
+    async def outbox_status(self, ctx):
+        """[관리자용] 메시지 발송 대기열 현황을 확인합니다."""
+        m = self.outbox.metrics()
+        waiting = " / ".join(f"{name} {m['by_priority'].get(level, 0)}" for level, name in ((INTERACTIVE, "응답"), (NORMAL, "알림"), (BACKGROUND, "현황판")))
+        await ctx.send(f"📮 대기 중 {m['queued']}개 ({m['channels']}개 채널, 최대 {m['max_depth']}개, 가장 오래된 것 {m['oldest_wait']:.1f}초)\n"
+                       f"> 우선순위별: {waiting}\n"
+                       f"> 전송 {m.get('sent', 0)}회 (합쳐진 메시지 {m.get('merged', 0)}개), 수정 {m.get('edits', 0)}회 (생략 {m.get('edits_coalesced', 0)}회), "
+                       f"실패 {m.get('failed', 0)}회 (429 {m.get('rate_limited', 0)}회)")
+
+    @outbox_status.error
+    async def outbox_status_error(self, ctx, error):
+        if isinstance(error, commands.NotOwner):
+            await ctx.send("이 명령어는 봇 소유자만 사용할 수 있습니다.")
+
+
+async def setup(bot):
+    await bot.add_cog(AdminCog(bot))
@@ -2,102 +2,91 @@
 
 import discord
 from discord.ext import commands
+from core.codecs import PrettyJsonCodec
+from core.lookup import audit_actor, find_player_by_name
+from core.schema import SCHEMA_VERSION, new_player_record
 import json
 import asyncio
-import os
+import io
 import random
-from datetime import datetime, time, timedelta, timezone
-import pytz
 
 
-# Cog 외부의 헬퍼 함수 (데이터 로딩/저장)
-def load_data():
-    if not os.path.exists("player_data.json"): return {}
-    with open("player_data.json", 'r', encoding='utf-8') as f: return json.load(f)
-
-def save_data(data):
-    with open("player_data.json", 'w', encoding='utf-8') as f: json.dump(data, f, indent=4, ensure_ascii=False)
+# !등록 대화의 상태 → (질문, 제한 시간). 답은 GrowthCog._register_step()이 처리
+REGISTER_STEPS = {
+    "class": ("직업을 선택해주세요. (모든 문항 느낌표 없이 작성)\n> `{classes}`", 60.0),
+    "confirm": ("**{class}**을(를) 선택하셨습니다. 확정하시겠습니까? (`예` 또는 `아니오`)", 30.0),
+    "name": ("사용할 이름을 입력해주세요.", 60.0),
+    "emoji": ("맵에서 자신을 나타낼 대표 이모지를 하나 입력해주세요.", 60.0),
+    "color": ("대표 색상을 HEX 코드로 입력해주세요. (예: `#FFFFFF`)", 60.0),
+}
 
 # Cog 클래스 정의
 class GrowthCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        # KST, CLASSES 등 필요한 변수를 self에 저장할 수 있습니다.
-        self.KST = timezone(timedelta(hours=9))
+        self.store = bot.store
+        # 일일 정보(도전/목표 횟수)를 쓰는 명령어는 resets.get_player()로 조회 (필요하면 그 자리에서 초기화)
+        self.resets = bot.reset_scheduler
+        # 현지 시각 계산은 모두 clock(core.clock.LocalClock)으로
+        self.clock = bot.clock
+        # 답을 기다리는 명령어(확인, !등록 등)는 conversations(core.conversations.Conversations)로
+        self.conversations = bot.conversations
+        # CLASSES 등 필요한 변수를 self에 저장할 수 있습니다.
         self.CLASSES = ["마법사", "마검사", "검사"]
 
     # @bot.command 대신 @commands.command() 를 사용합니다.
     @commands.command(name="등록")
     async def register(self, ctx):
         player_id = str(ctx.author.id)
-        all_data = load_data()
-        if player_id in all_data and all_data[player_id].get("registered", False):
+        existing = self.store.get(player_id)
+        if existing and existing.get("registered", False):
             await ctx.send("이미 등록된 플레이어입니다.")
             return
 
-        def check(m):
-            return m.author == ctx.author and m.channel == ctx.channel
-
-        try:
-            # 직업 선택
-            await ctx.send(f"직업을 선택해주세요. (모든 문항 느낌표 없이 작성)\n> `{'`, `'.join(self.CLASSES)}`")
-            msg = await self.bot.wait_for('message', check=check, timeout=60.0)
-            if msg.content not in self.CLASSES:
-                await ctx.send("잘못된 직업입니다. 등록을 다시 시작해주세요.")
-                return
-            player_class = msg.content
-            
-            await ctx.send(f"**{player_class}**을(를) 선택하셨습니다. 확정하시겠습니까? (`예` 또는 `아니오`)")
-            msg = await self.bot.wait_for('message', check=check, timeout=30.0)
-            if msg.content.lower() != '예':
-                await ctx.send("등록이 취소되었습니다.")
-                return
-
-            # 이름, 이모지, 색상 입력
-            await ctx.send("사용할 이름을 입력해주세요.")
-            name_msg = await self.bot.wait_for('message', check=check, timeout=60.0)
-
-            forbidden_chars = ['*', '_', '~', '`', '|', '>']
-            if any(char in name_msg.content for char in forbidden_chars):
-                return await ctx.send(f"이름에는 특수문자를 사용할 수 없습니다.")
-            
-            await ctx.send("맵에서 자신을 나타낼 대표 이모지를 하나 입력해주세요.")
-            emoji_msg = await self.bot.wait_for('message', check=check, timeout=60.0)
-
-            await ctx.send("대표 색상을 HEX 코드로 입력해주세요. (예: `#FFFFFF`)")
-            color_msg = await self.bot.wait_for('message', check=check, timeout=60.0)
-
-            hex_code = color_msg.content
-            if not (hex_code.startswith('#') and len(hex_code) == 7):
-                return await ctx.send("잘못된 형식입니다. `#`을 포함한 7자리 HEX 코드를 입력해주세요.")
+        convo = await self.conversations.begin(ctx)
+        if not convo: return
+        # 상태마다 질문 → 답 처리(_register_step) → 다음 상태. 다음 상태가 None이면 등록 취소
+        state, answers = "class", {}
+        with convo:
             try:
-                int(hex_code[1:], 16)
-            except ValueError:
-                return await ctx.send("올바르지 않은 HEX 코드입니다. 0-9, A-F 사이의 문자를 사용해주세요.")
-
-            all_data[player_id] = {
-                "mental": 0, "physical": 0,
-                "registered": True, "class": player_class, "name": name_msg.content, 
-                "emoji": emoji_msg.content, "color": hex_code,
-                "challenge_type": None, "challenge_registered_today": False,
-                "rest_buff_active": False,
-                "school_points": 0, "inventory": [],
-                "goals": [], "daily_goal_info": {},
-                "today_blessing": None,
-                "last_blessing_date": None,
-                "timezone": None,
-                "attribute": None 
-            }
-            save_data(all_data)
-            await ctx.send("🎉 등록이 완료되었습니다!")
-        except asyncio.TimeoutError:
-            await ctx.send("시간이 초과되어 등록이 취소되었습니다.")
-            save_data(all_data)
-            await ctx.send("🎉 등록이 완료되었습니다!")
-
-        except asyncio.TimeoutError:
-            await ctx.send("시간이 초과되어 등록이 취소되었습니다.")
-        
+                while state != "done":
+                    prompt, timeout = REGISTER_STEPS[state]
+                    await ctx.send(prompt.format(classes="`, `".join(self.CLASSES), **answers))
+                    msg = await convo.ask(timeout=timeout)
+                    state, error = self._register_step(state, msg.content, answers)
+                    if state is None:
+                        return await ctx.send(error)
+            except asyncio.TimeoutError:
+                return await ctx.send("시간이 초과되어 등록이 취소되었습니다.")
+
+        self.store.set(player_id, new_player_record({"registered": True, **answers}))
+        await ctx.send("🎉 등록이 완료되었습니다!")
+
+    def _register_step(self, state, text, answers):
+        """!등록의 한 단계 답을 처리하고 (다음 상태, 취소 안내)를 반환합니다."""
+        if state == "class":
+            if text not in self.CLASSES: return None, "잘못된 직업입니다. 등록을 다시 시작해주세요."
+            answers["class"] = text
+            return "confirm", None
+        if state == "confirm":
+            if text.lower() != '예': return None, "등록이 취소되었습니다."
+            return "name", None
+        if state == "name":
+            forbidden_chars = ['*', '_', '~', '`', '|', '>']
+            if any(char in text for char in forbidden_chars): return None, "이름에는 특수문자를 사용할 수 없습니다."
+            answers["name"] = text
+            return "emoji", None
+        if state == "emoji":
+            answers["emoji"] = text
+            return "color", None
+        if not (text.startswith('#') and len(text) == 7):
+            return None, "잘못된 형식입니다. `#`을 포함한 7자리 HEX 코드를 입력해주세요."
+        try:
+            int(text[1:], 16)
+        except ValueError:
+            return None, "올바르지 않은 HEX 코드입니다. 0-9, A-F 사이의 문자를 사용해주세요."
+        answers["color"] = text
+        return "done", None
 
 
 
@@ -105,19 +94,19 @@ class GrowthCog(commands.Cog):
     async def check_stats(self, ctx, member: discord.Member = None):
         """자신 또는 다른 플레이어의 프로필과 스탯 정보를 확인합니다."""
         target_user = member or ctx.author
-        all_data = load_data()
-        player_id = str(target_user.id)
-        player_data = all_data.get(player_id)
+        player_data = self.store.get(target_user.id)
 
         if not player_data or not player_data.get("registered", False):
             return await ctx.send(f"**{target_user.display_name}**님은 아직 `!등록`하지 않은 플레이어입니다.")
-        
+        await ctx.send(embed=self.build_stats_embed(target_user, player_data))
+
+    def build_stats_embed(self, target_user, player_data):
+        """프로필/스탯 Embed를 만듭니다. (!스탯조회, !도전완료에서 사용)"""
         # 스탯 계산
-        mental = player_data.get('mental', 0)
-        physical = player_data.get('physical', 0)
-        total_stats = mental + physical
-        level = 1 + total_stats // 5
-        progress = total_stats % 5
+        mental = player_data.mental
+        physical = player_data.physical
+        level = player_data.level
+        progress = player_data.total_stats % 5
         progress_bar = '■ ' * progress + '□ ' * (5 - progress)
 
     
@@ -127,7 +116,7 @@ class GrowthCog(commands.Cog):
         # Embed 생성
         embed = discord.Embed(
             title=f"{player_data.get('name', target_user.display_name)}님의 프로필",
-            color=int(player_data.get('color', '#FFFFFF')[1:], 16)
+            color=player_data.color_value
         )
         embed.set_thumbnail(url=target_user.display_avatar.url)
         
@@ -149,15 +138,13 @@ class GrowthCog(commands.Cog):
             value=f"**{progress_bar}**",
             inline=False
         )
-        
-        await ctx.send(embed=embed)
+        return embed
    
     @commands.command(name="정보수정")
     async def edit_info(self, ctx, item_to_edit: str, *, new_value: str):
         """자신의 이름, 이모지, 컬러 정보를 수정합니다."""
-        all_data = load_data()
         player_id = str(ctx.author.id)
-        player_data = all_data.get(player_id)
+        player_data = self.store.get(player_id)
 
         if not player_data or not player_data.get("registered"):
             return await ctx.send("먼저 `!등록`을 진행해주세요.")
@@ -186,7 +173,7 @@ class GrowthCog(commands.Cog):
         
         # --- 데이터 업데이트 및 저장 ---
         player_data[key_to_edit] = new_value
-        save_data(all_data)
+        self.store.mark_dirty(player_id)
         
         await ctx.send(f"✅ **{item_to_edit}** 정보가 '{new_value}' (으)로 성공적으로 변경되었습니다.")
     @commands.command(name="리셋")
@@ -194,9 +181,9 @@ class GrowthCog(commands.Cog):
         """자신의 모든 데이터(프로필, 스탯)를 완전히 초기화합니다."""
         
         player_id = str(ctx.author.id)
-        all_data = load_data()
+        player_data = self.store.get(player_id)
 
-        if player_id not in all_data or not all_data[player_id].get("registered", False):
+        if not player_data or not player_data.get("registered", False):
             await ctx.send("아직 등록된 정보가 없어 초기화할 수 없습니다.")
             return
 
@@ -208,41 +195,19 @@ class GrowthCog(commands.Cog):
                         f"동의하시면 30초 안에 `초기화 동의`라고 입력해주세요.",
             color=discord.Color.red()
         )
-        await ctx.send(embed=embed)
-
-        def check(m):
-            return m.author == ctx.author and m.channel == ctx.channel and m.content == "초기화 동의"
-
-        try:
-            await self.bot.wait_for('message', check=check, timeout=30.0)
-        except asyncio.TimeoutError:
-            return await ctx.send("시간이 초과되어 초기화가 취소되었습니다.")
+        convo = await self.conversations.begin(ctx)
+        if not convo: return
+        with convo:
+            await ctx.send(embed=embed)
+            try:
+                await convo.ask(lambda m: m.content == "초기화 동의", timeout=30.0)
+            except asyncio.TimeoutError:
+                return await ctx.send("시간이 초과되어 초기화가 취소되었습니다.")
 
         # 2단계: 데이터 초기화 진행 (스탯 보존 로직 삭제)
         
-        # ▼▼▼ 여기가 수정된 부분입니다 ▼▼▼
-        # 모든 정보를 담은 새로운 딕셔너리로 덮어씁니다.
-        all_data[player_id] = {
-            'mental': 0, # 스탯을 0으로 초기화
-            'physical': 0, # 스탯을 0으로 초기화
-            'registered': False,
-            'class': None,
-            'name': None,
-            'emoji': None,
-            'color': None,
-            'attribute': None,
-            'advanced_class': None,
-            'challenge_type': None,
-            'challenge_registered_today': False,
-            'rest_buff_active': False,
-            'today_blessing': None,
-            'last_blessing_date': None,
-            'timezone': None
-            
-        }
-        # ▲▲▲ 여기가 수정된 부분입니다 ▲▲▲
-        
-        save_data(all_data)
+        # !등록과 같은 구조의 빈 데이터로 덮어씁니다. (스탯, 포인트, 인벤토리 포함)
+        self.store.set(player_id, new_player_record())
         
         # 3단계: 완료 메시지 전송
         await ctx.send(f"✅ **{ctx.author.display_name}**님의 모든 데이터가 성공적으로 초기화되었습니다. `!등록` 명령어를 사용해 새로운 여정을 시작하세요!")
@@ -254,9 +219,8 @@ class GrowthCog(commands.Cog):
     @commands.command(name="속성부여")
     async def grant_attribute(self, ctx):
         """5레벨 도달 시 Gut, Wit, Heart 중 하나의 속성을 부여받습니다."""
-        all_data = load_data()
         player_id = str(ctx.author.id)
-        player_data = all_data.get(player_id)
+        player_data = self.store.get(player_id)
 
         if not player_data or not player_data.get("registered"):
             return await ctx.send("먼저 `!등록`을 진행해주세요.")
@@ -264,22 +228,21 @@ class GrowthCog(commands.Cog):
         if player_data.get("attribute") is not None:
             return await ctx.send(f"이미 `{player_data['attribute']}` 속성을 부여받았습니다.")
 
-        level = 1 + ((player_data.get('mental', 0) + player_data.get('physical', 0)) // 5)
+        level = player_data.level
         if level < 5:
             return await ctx.send(f"속성 부여는 5레벨부터 가능합니다. (현재 레벨: {level})")
 
         attributes = ["Gut", "Wit", "Heart"]
-        await ctx.send(f"부여받을 속성을 선택해주세요. (30초 안에 입력)\n> `{'`, `'.join(attributes)}`")
-
-        def check(m):
-            return m.author == ctx.author and m.channel == ctx.channel and m.content.title() in attributes
-
+        convo = await self.conversations.begin(ctx)
+        if not convo: return
         try:
-            msg = await self.bot.wait_for('message', check=check, timeout=30.0)
+            with convo:
+                await ctx.send(f"부여받을 속성을 선택해주세요. (30초 안에 입력)\n> `{'`, `'.join(attributes)}`")
+                msg = await convo.ask(lambda m: m.content.title() in attributes, timeout=30.0)
             chosen_attribute = msg.content.title() # Gut, Wit, Heart 첫 글자 대문자로 통일
 
             player_data["attribute"] = chosen_attribute
-            save_data(all_data)
+            self.store.mark_dirty(player_id)
 
             await ctx.send(f"✅ **{chosen_attribute}** 속성이 부여되었습니다! 이제 당신의 행동은 새로운 힘을 갖게 될 것입니다.")
 
@@ -290,7 +253,7 @@ class GrowthCog(commands.Cog):
     @commands.command(name="시간대설정")
     async def set_timezone(self, ctx, timezone_name: str):
         """자신의 시간대를 설정합니다. (예: !시간대설정 Asia/Seoul)"""
-        if timezone_name not in pytz.all_timezones:
+        if not self.clock.is_valid(timezone_name):
             embed = discord.Embed(
                 title="❌ 잘못된 시간대 이름입니다.",
                 description="[이곳](https://en.wikipedia.org/wiki/List_of_tz_database_time_zones)에서 자신의 지역에 맞는 'TZ database name'을 찾아 정확하게 입력해주세요.",
@@ -299,16 +262,14 @@ class GrowthCog(commands.Cog):
             embed.add_field(name="입력 예시", value="`!시간대설정 America/New_York`\n`!시간대설정 Europe/London`")
             return await ctx.send(embed=embed)
 
-        all_data = load_data()
         player_id = str(ctx.author.id)
-        player_data = all_data.get(player_id)
+        player_data = self.store.get(player_id)
         if not player_data: return await ctx.send("먼저 `!등록`을 진행해주세요.")
             
         player_data['timezone'] = timezone_name
-        save_data(all_data)
+        self.store.mark_dirty(player_id)
         
-        user_tz = pytz.timezone(timezone_name)
-        current_time = datetime.now(user_tz).strftime("%Y년 %m월 %d일 %H:%M")
+        current_time = self.clock.now(timezone_name).strftime("%Y년 %m월 %d일 %H:%M")
 
         embed = discord.Embed(
             title="✅ 시간대 설정 완료",
@@ -325,34 +286,21 @@ class GrowthCog(commands.Cog):
     @commands.command(name="정신도전")
     async def register_mental_challenge(self, ctx):
 
-        all_data = load_data()
         player_id = str(ctx.author.id)
-        player_data = all_data.get(player_id, {}) # 데이터가 없는 유저를 위해 기본값 설정
+        player_data = self.resets.get_player(player_id) or {} # 데이터가 없는 유저를 위해 기본값 설정
 
         if not player_data or not player_data.get("registered"):
             return await ctx.send("먼저 `!등록`을 진행해주세요.")
 
-        user_tz_str = player_data.get("timezone", "Asia/Seoul")
-        try:
-            user_tz = pytz.timezone(user_tz_str)
-        except pytz.UnknownTimeZoneError:
-            user_tz = self.KST # 잘못된 값이 저장된 경우 KST로
-
-        now_local = datetime.now(user_tz).time()
-
-        if not (time(6, 0) <= now_local < time(14, 0)):
+        user_tz = player_data.get("timezone")
+        if not self.clock.registration_open(user_tz):
+            now_local = self.clock.now(user_tz)
             embed = discord.Embed(title="❌ 도전 등록 실패", description=f"**도전 등록은 오전 6시부터 오후 2시까지만 가능합니다.**\n(현재 시간: {now_local.strftime('%H:%M')})", color=discord.Color.red())
-            if "timezone" not in player_data:
+            if not player_data.get("timezone"):
                 embed.set_footer(text="`!시간대설정` 명령어로 자신의 시간대를 설정할 수 있습니다.")
             await ctx.send(embed=embed)
             return
 
-        all_data = load_data()
-        player_id = str(ctx.author.id)
-        if player_id not in all_data:
-            all_data[player_id] = {"mental": 0, "physical": 0, "challenge_type": None, "challenge_registered_today": False}
-        player_data = all_data[player_id]
-
         if player_data.get("challenge_registered_today", False):
             action_type = player_data.get("challenge_type", "알 수 없는 활동")
             # '완료됨' 상태에 대한 구체적인 메시지 추가
@@ -371,7 +319,7 @@ class GrowthCog(commands.Cog):
 
         player_data["challenge_type"] = "정신도전"
         player_data["challenge_registered_today"] = True
-        save_data(all_data)
+        self.store.mark_dirty(player_id)
         
         embed = discord.Embed(title="🧠 '정신' 도전 등록 완료!", description=f"**{ctx.author.display_name}**님, 오늘의 '정신' 도전이 정상적으로 등록되었습니다.", color=discord.Color.purple())
         embed.add_field(name="진행 안내", value="오후 4시 이후 `!도전완료` 명령어를 통해\n결과를 보고하고 스탯을 획득하세요!", inline=False)
@@ -381,34 +329,21 @@ class GrowthCog(commands.Cog):
     @commands.command(name="육체도전")
     async def register_physical_challenge(self, ctx):
 
-        all_data = load_data()
         player_id = str(ctx.author.id)
-        player_data = all_data.get(player_id, {}) # 데이터가 없는 유저를 위해 기본값 설정
+        player_data = self.resets.get_player(player_id) or {} # 데이터가 없는 유저를 위해 기본값 설정
 
         if not player_data or not player_data.get("registered"):
             return await ctx.send("먼저 `!등록`을 진행해주세요.")
 
-        user_tz_str = player_data.get("timezone", "Asia/Seoul")
-        try:
-            user_tz = pytz.timezone(user_tz_str)
-        except pytz.UnknownTimeZoneError:
-            user_tz = self.KST # 잘못된 값이 저장된 경우 KST로
-
-        now_local = datetime.now(user_tz).time()
-
-        if not (time(6, 0) <= now_local < time(14, 0)):
+        user_tz = player_data.get("timezone")
+        if not self.clock.registration_open(user_tz):
+            now_local = self.clock.now(user_tz)
             embed = discord.Embed(title="❌ 도전 등록 실패", description=f"**도전 등록은 오전 6시부터 오후 2시까지만 가능합니다.**\n(현재 시간: {now_local.strftime('%H:%M')})", color=discord.Color.red())
-            if "timezone" not in player_data:
+            if not player_data.get("timezone"):
                 embed.set_footer(text="`!시간대설정` 명령어로 자신의 시간대를 설정할 수 있습니다.")
             await ctx.send(embed=embed)
             return
 
-        all_data = load_data()
-        player_id = str(ctx.author.id)
-        if player_id not in all_data:
-            all_data[player_id] = {"mental": 0, "physical": 0, "challenge_type": None, "challenge_registered_today": False}
-        player_data = all_data[player_id]
-
         if player_data.get("challenge_registered_today", False):
             action_type = player_data.get("challenge_type", "알 수 없는 활동")
             # '완료됨' 상태에 대한 구체적인 메시지 추가
@@ -427,7 +362,7 @@ class GrowthCog(commands.Cog):
 
         player_data["challenge_type"] = "육체도전"
         player_data["challenge_registered_today"] = True
-        save_data(all_data)
+        self.store.mark_dirty(player_id)
         
         embed = discord.Embed(title="💪 '육체' 도전 등록 완료!", description=f"**{ctx.author.display_name}**님, 오늘의 '육체' 도전이 정상적으로 등록되었습니다.", color=discord.Color.gold())
         embed.add_field(name="진행 안내", value="오후 4시 이후 `!도전완료` 명령어를 통해\n결과를 보고하고 스탯을 획득하세요!", inline=False)
@@ -437,38 +372,23 @@ class GrowthCog(commands.Cog):
     @commands.command(name="도전완료")
     async def complete_challenge(self, ctx):
 
-        all_data = load_data()
         player_id = str(ctx.author.id)
-        player_data = all_data.get(player_id, {}) # 데이터가 없는 유저를 위해 기본값 설정
+        player_data = self.resets.get_player(player_id) or {} # 데이터가 없는 유저를 위해 기본값 설정
 
         if not player_data or not player_data.get("registered"):
             return await ctx.send("먼저 `!등록`을 진행해주세요.")
 
-        user_tz_str = player_data.get("timezone", "Asia/Seoul")
-        try:
-            user_tz = pytz.timezone(user_tz_str)
-        except pytz.UnknownTimeZoneError:
-            user_tz = self.KST
-            
-        # ▼▼▼ 여기가 수정된 부분입니다 ▼▼▼
-        # .time() 대신, 시간(hour)을 직접 비교하기 위해 datetime 객체 전체를 사용합니다.
-        now_local = datetime.now(user_tz)
-        
         # 현지 시간이 [오후 4시 이후] 이거나 [새벽 2시 이전]인 경우를 모두 허용합니다.
-        if not (now_local.hour >= 16 or now_local.hour < 2): 
+        user_tz = player_data.get("timezone")
+        if not self.clock.completion_open(user_tz):
+            now_local = self.clock.now(user_tz)
             embed = discord.Embed(title="❌ 도전 완료 실패", description=f"**도전 완료는 오후 4시부터 새벽 2시까지만 가능합니다.**\n(현재 시간: {now_local.strftime('%H:%M')})", color=discord.Color.red())
-            if "timezone" not in player_data:
+            if not player_data.get("timezone"):
                 embed.set_footer(text="`!시간대설정` 명령어로 자신의 시간대를 설정할 수 있습니다.")
             await ctx.send(embed=embed)
             return
 
-            
-        all_data = load_data()
-        player_id = str(ctx.author.id)
-        if player_id not in all_data:
-            all_data[player_id] = {"mental": 0, "physical": 0, "challenge_type": None, "challenge_registered_today": False}
-        player_data = all_data[player_id]
-        
+
         challenge_type = player_data.get("challenge_type")
 
         if not player_data.get("challenge_registered_today", False) or challenge_type is None:
@@ -482,59 +402,43 @@ class GrowthCog(commands.Cog):
             return
             
         if challenge_type == "정신도전":
-            player_data["mental"] += 1
+            player_data.mental += 1
             stat_name, emoji, color = "정신", "🧠", discord.Color.purple()
         elif challenge_type == "육체도전":
-            player_data["physical"] += 1
+            player_data.physical += 1
             stat_name, emoji, color = "육체", "💪", discord.Color.gold()\
             
         
         
         # 완료 처리: challenge_type을 None으로 바꿔 중복 완료 방지
         player_data["challenge_type"] = "완료됨"
-        save_data(all_data)
+        self.store.mark_dirty(player_id)
         
         embed = discord.Embed(title=f"{emoji} 도전 성공! {stat_name} 스탯 상승!", description=f"**{ctx.author.display_name}**님, 오늘의 도전을 성공적으로 완수했습니다.", color=color)
         embed.add_field(name="획득 스탯", value=f"**{stat_name} +1**", inline=False)
-        await ctx.send(embed=embed)
-
-        # `!스탯조회` 함수가 코드 내에 정의되어 있어야 합니다.
-        await self.check_stats(ctx)
+        # 성공 안내와 갱신된 프로필을 메시지 하나로 전송
+        await ctx.send(embeds=[embed, self.build_stats_embed(ctx.author, player_data)])
 
 
     @commands.command(name="휴식")
     async def take_rest(self, ctx):
         """6시~14시 사이에 오늘의 도전을 쉬고, 다음 전투를 위한 버프를 받습니다."""
 
-        all_data = load_data()
         player_id = str(ctx.author.id)
-        player_data = all_data.get(player_id, {}) # 데이터가 없는 유저를 위해 기본값 설정
+        player_data = self.resets.get_player(player_id) or {} # 데이터가 없는 유저를 위해 기본값 설정
 
         if not player_data or not player_data.get("registered"):
             return await ctx.send("먼저 `!등록`을 진행해주세요.")
 
-        user_tz_str = player_data.get("timezone", "Asia/Seoul")
-        try:
-            user_tz = pytz.timezone(user_tz_str)
-        except pytz.UnknownTimeZoneError:
-            user_tz = self.KST # 잘못된 값이 저장된 경우 KST로
-
-        now_local = datetime.now(user_tz).time()
-
-        if not (time(6, 0) <= now_local < time(14, 0)):
+        user_tz = player_data.get("timezone")
+        if not self.clock.registration_open(user_tz):
+            now_local = self.clock.now(user_tz)
             embed = discord.Embed(title="❌ 휴식 선언 실패", description=f"**휴식 선언은 오전 6시부터 오후 2시까지만 가능합니다.**\n(현재 시간: {now_local.strftime('%H:%M')})", color=discord.Color.red())
-            if "timezone" not in player_data:
+            if not player_data.get("timezone"):
                 embed.set_footer(text="`!시간대설정` 명령어로 자신의 시간대를 설정할 수 있습니다.")
             await ctx.send(embed=embed)
             return
 
-            
-        all_data = load_data()
-        player_id = str(ctx.author.id)
-        if player_id not in all_data or not all_data[player_id].get("registered", False):
-            await ctx.send("먼저 `!등록`을 진행해주세요.")
-            return
-        player_data = all_data[player_id]
 
         if player_data.get("challenge_registered_today", False):
             action_type = player_data.get("challenge_type", "활동")
@@ -545,7 +449,7 @@ class GrowthCog(commands.Cog):
         player_data["challenge_type"] = "휴식"
         player_data["challenge_registered_today"] = True
         player_data["rest_buff_active"] = True
-        save_data(all_data)
+        self.store.mark_dirty(player_id)
 
         embed = discord.Embed(title="🌙 편안한 휴식을 선택했습니다", description=f"**{ctx.author.display_name}**님, 오늘의 도전을 쉬고 재충전합니다.", color=discord.Color.green())
         embed.add_field(name="휴식 보너스", value="다음 전투 시작 시, 1회에 한해 **최대 체력이 증가**하는 효과를 받습니다.")
@@ -555,9 +459,8 @@ class GrowthCog(commands.Cog):
     @commands.command(name="축복")
     async def blessing(self, ctx):
         """오늘의 축복 메시지를 확인합니다."""
-        all_data = load_data()
         player_id = str(ctx.author.id)
-        player_data = all_data.get(player_id)
+        player_data = self.store.get(player_id)
 
         if not player_data or not player_data.get("registered"):
             return await ctx.send("먼저 `!등록`을 진행해주세요.")
@@ -581,13 +484,7 @@ class GrowthCog(commands.Cog):
             "마음 속에서 기쁨이 샘솟으리니..."
         ]
 
-        user_tz_str = player_data.get("timezone", "Asia/Seoul")
-        try:
-            user_tz = pytz.timezone(user_tz_str)
-        except pytz.UnknownTimeZoneError:
-            user_tz = self.KST # 잘못된 값이 저장된 경우 KST로
-        
-        today_local_str = datetime.now(user_tz).strftime('%Y-%m-%d')
+        today_local_str = self.clock.today(player_data.get("timezone"))
         last_blessing_date = player_data.get("last_blessing_date")
 
         # 2. 마지막으로 축복을 받은 날짜가 오늘(현지 기준)이 아니라면, 새로운 축복을 뽑습니다.
@@ -595,7 +492,7 @@ class GrowthCog(commands.Cog):
             new_blessing = random.choice(blessing_list)
             player_data["today_blessing"] = new_blessing
             player_data["last_blessing_date"] = today_local_str # 오늘 날짜를 기록
-            save_data(all_data)
+            self.store.mark_dirty(player_id)
             current_blessing = new_blessing
         # 3. 오늘 이미 축복을 받았다면, 저장된 축복을 불러옵니다.
         else:
@@ -606,7 +503,7 @@ class GrowthCog(commands.Cog):
         embed = discord.Embed(
             title="✨ 오늘의 축복 ✨",
             description=f"**{current_blessing}**",
-            color=int(player_data['color'][1:], 16)
+            color=player_data.color_value
         )
         embed.set_footer(text=f"삼여신의 축복을 당신에게.")
         await ctx.send(embed=embed)
@@ -617,9 +514,8 @@ class GrowthCog(commands.Cog):
     @commands.command(name="목표등록")
     async def register_goal(self, ctx, *, goal_name: str):
         """오늘의 목표를 등록합니다. (하루에 2번, 최대 10개)"""
-        all_data = load_data()
         player_id = str(ctx.author.id)
-        player_data = all_data.get(player_id)
+        player_data = self.resets.get_player(player_id)
 
         if not player_data or not player_data.get("registered"):
             return await ctx.send("먼저 `!등록`을 진행해주세요.")
@@ -633,12 +529,7 @@ class GrowthCog(commands.Cog):
 
         # --- ▼▼▼ 여기가 수정된 부분입니다 ▼▼▼ ---
         # 1. 유저의 시간대를 불러와 오늘 날짜를 계산합니다.
-        user_tz_str = player_data.get("timezone", "Asia/Seoul")
-        try:
-            user_tz = pytz.timezone(user_tz_str)
-        except pytz.UnknownTimeZoneError:
-            user_tz = self.KST
-        today_local_str = datetime.now(user_tz).strftime('%Y-%m-%d')
+        today_local_str = self.clock.today(player_data.get("timezone"))
         
         # 2. 유저의 일일 목표 정보를 불러옵니다.
         daily_info = player_data.get("daily_goal_info", {})
@@ -658,7 +549,7 @@ class GrowthCog(commands.Cog):
         player_data["goals"] = goals
         player_data["daily_goal_info"] = {"date": today_local_str, "count": daily_count + 1}
         
-        save_data(all_data)
+        self.store.mark_dirty(player_id)
         # --- ▲▲▲ 여기가 수정된 부분입니다 ▲▲▲ ---
 
         await ctx.send(f"✅ 새로운 목표가 등록되었습니다: **{goal_name}** (오늘 {daily_count + 1}/2번째)")
@@ -668,8 +559,7 @@ class GrowthCog(commands.Cog):
     @commands.command(name="목표조회")
     async def view_goals(self, ctx):
         """자신이 등록한 목표 목록을 확인합니다."""
-        all_data = load_data()
-        player_data = all_data.get(str(ctx.author.id))
+        player_data = self.store.get(ctx.author.id)
 
         if not player_data or not player_data.get("registered"):
             return await ctx.send("먼저 `!등록`을 진행해주세요.")
@@ -678,7 +568,7 @@ class GrowthCog(commands.Cog):
         
         embed = discord.Embed(
             title=f"🎯 {ctx.author.display_name}의 목표 목록",
-            color=int(player_data.get('color', '#FFFFFF')[1:], 16)
+            color=player_data.color_value
         )
 
         if not goals:
@@ -697,9 +587,8 @@ class GrowthCog(commands.Cog):
         if not (1 <= goal_number <= 10):
             return await ctx.send("1번에서 10번까지의 목표만 달성할 수 있습니다.")
 
-        all_data = load_data()
         player_id = str(ctx.author.id)
-        player_data = all_data.get(player_id)
+        player_data = self.store.get(player_id)
 
         if not player_data or not player_data.get("registered"):
             return await ctx.send("먼저 `!등록`을 진행해주세요.")
@@ -711,15 +600,13 @@ class GrowthCog(commands.Cog):
 
         goal_to_achieve = goals[goal_number - 1]
 
-        await ctx.send(f"**'{goal_to_achieve}'** 목표를 달성한 것이 맞습니까? (30초 안에 `예` 또는 `아니오` 입력)")
-        
-
-        def check(m): 
-            return m.author == ctx.author and m.channel == ctx.channel and m.content.lower() in ['예', '아니오']
-        
+        convo = await self.conversations.begin(ctx)
+        if not convo: return
         try:
             # 2. 사용자의 응답 메시지(msg)를 받아옵니다.
-            msg = await self.bot.wait_for('message', check=check, timeout=30.0)
+            with convo:
+                await ctx.send(f"**'{goal_to_achieve}'** 목표를 달성한 것이 맞습니까? (30초 안에 `예` 또는 `아니오` 입력)")
+                msg = await convo.ask(lambda m: m.content.lower() in ['예', '아니오'], timeout=30.0)
 
             # 3. 응답이 '아니오'일 경우, 취소 메시지를 보내고 함수를 종료합니다.
             if msg.content.lower() == '아니오':
@@ -735,7 +622,7 @@ class GrowthCog(commands.Cog):
         player_data["goals"] = goals
         
 
-        player_data['school_points'] = player_data.get('school_points', 0) + 2
+        player_data.school_points += 2
         
         reward_list = ["🎓 스쿨 포인트 +2"]
         stat_up_message = ""
@@ -747,13 +634,13 @@ class GrowthCog(commands.Cog):
             stat_up_message = f"✨ **놀라운 성과! {stat_kor} 스탯 +1**"
             reward_list.append(stat_up_message)
 
-        save_data(all_data)
+        self.store.mark_dirty(player_id)
 
         # 2. Embed 생성 및 전송
         embed = discord.Embed(
             title="🎉 목표 달성!",
             description=f"**'{achieved_goal}'** 목표를 성공적으로 완수했습니다!",
-            color=int(player_data.get('color', '#FFFFFF')[1:], 16)
+            color=player_data.color_value
         )
         embed.add_field(name="[ 획득 보상 ]", value="\n".join(reward_list))
         
@@ -765,9 +652,8 @@ class GrowthCog(commands.Cog):
     @commands.command(name="목표수정")
     async def edit_goal(self, ctx, goal_number: int, *, new_goal_name: str):
         """번호에 해당하는 목표의 내용을 수정합니다."""
-        all_data = load_data()
         player_id = str(ctx.author.id)
-        player_data = all_data.get(player_id)
+        player_data = self.store.get(player_id)
 
         if not player_data or not player_data.get("registered"):
             return await ctx.send("먼저 `!등록`을 진행해주세요.")
@@ -786,12 +672,12 @@ class GrowthCog(commands.Cog):
         original_goal = goals[goal_number - 1]
         goals[goal_number - 1] = new_goal_name
         
-        save_data(all_data)
+        self.store.mark_dirty(player_id)
 
         embed = discord.Embed(
             title="🎯 목표 수정 완료",
             description=f"**{goal_number}번** 목표의 내용이 성공적으로 변경되었습니다.",
-            color=int(player_data.get('color', '#FFFFFF')[1:], 16)
+            color=player_data.color_value
         )
         embed.add_field(name="변경 전", value=original_goal, inline=False)
         embed.add_field(name="변경 후", value=new_goal_name, inline=False)
@@ -806,9 +692,8 @@ class GrowthCog(commands.Cog):
         if not (1 <= goal_number <= 10):
             return await ctx.send("1번에서 10번까지의 목표만 중단할 수 있습니다.")
 
-        all_data = load_data()
         player_id = str(ctx.author.id)
-        player_data = all_data.get(player_id)
+        player_data = self.store.get(player_id)
 
         if not player_data or not player_data.get("registered"):
             return await ctx.send("먼저 `!등록`을 진행해주세요.")
@@ -821,16 +706,13 @@ class GrowthCog(commands.Cog):
         goal_to_abandon = goals[goal_number - 1]
 
         # 사용자에게 재확인
-        await ctx.send(f"**'{goal_to_abandon}'** 목표를 정말로 중단하시겠습니까? (30초 안에 `예` 또는 `아니오` 입력)")
-        
-        # ▼▼▼ 여기가 수정된 부분입니다 ▼▼▼
-        # 1. check 함수가 '예', '아니오'를 모두 유효한 응답으로 인식하게 합니다.
-        def check(m): 
-            return m.author == ctx.author and m.channel == ctx.channel and m.content.lower() in ['예', '아니오']
-        
+        convo = await self.conversations.begin(ctx)
+        if not convo: return
         try:
-            # 2. 사용자의 응답 메시지(msg)를 받아옵니다.
-            msg = await self.bot.wait_for('message', check=check, timeout=30.0)
+            # 2. 사용자의 응답 메시지(msg)를 받아옵니다. ('예', '아니오'만 답으로 인식)
+            with convo:
+                await ctx.send(f"**'{goal_to_abandon}'** 목표를 정말로 중단하시겠습니까? (30초 안에 `예` 또는 `아니오` 입력)")
+                msg = await convo.ask(lambda m: m.content.lower() in ['예', '아니오'], timeout=30.0)
 
             # 3. 응답이 '아니오'일 경우, 취소 메시지를 보내고 함수를 종료합니다.
             if msg.content.lower() == '아니오':
@@ -843,8 +725,8 @@ class GrowthCog(commands.Cog):
         player_data["goals"] = goals
         
         # 격려 보상: 스쿨 포인트 +1
-        player_data['school_points'] = player_data.get('school_points', 0) + 1
-        save_data(all_data)
+        player_data.school_points += 1
+        self.store.mark_dirty(player_id)
 
         await ctx.send(f"😊 **'{abandoned_goal}'** 목표를 중단했습니다. 다음 도전을 응원합니다! (스쿨 포인트 +1)")
 
@@ -856,16 +738,16 @@ class GrowthCog(commands.Cog):
         """[관리자용] 모든 유저의 일일 도전 상태를 수동으로 초기화합니다."""
         await ctx.send("모든 유저의 일일 도전 상태 초기화를 시작합니다...")
         
-        all_data = load_data()
         reset_count = 0
-        for player_id, player_data in all_data.items():
+        for player_id, player_data in self.store.items():
             # 도전 상태 플래그가 True인 경우에만 초기화 진행
             if player_data.get("challenge_registered_today") is True:
                 player_data["challenge_registered_today"] = False
                 player_data["challenge_type"] = None
+                self.store.mark_dirty(player_id)
                 reset_count += 1
+        self.store.note(audit_actor(ctx), f"{reset_count}명의 도전 상태 초기화")
         
-        save_data(all_data)
         await ctx.send(f"✅ 완료! 총 {reset_count}명의 유저 도전 상태를 초기화했습니다.")
 
     @manual_reset_challenges.error
@@ -880,21 +762,13 @@ class GrowthCog(commands.Cog):
     async def view_user_data(self, ctx, *, target_name: str):
         """[관리자용] 등록된 이름으로 유저의 raw data를 확인합니다."""
         
-        all_data = load_data()
-        
-        # 1. 이름으로 플레이어 찾기
-        target_id, player_data = None, None
-        for pid, pdata in all_data.items():
-            if pdata.get("name") == target_name.strip('"'):
-                target_id = pid
-                player_data = pdata
-                break
-
-        if not player_data:
-            return await ctx.send(f"'{target_name}' 이름을 가진 플레이어를 찾을 수 없습니다.")
+        # 1. 이름으로 플레이어 찾기 (이름 인덱스 사용, 동명이인이면 안내 후 종료)
+        target_id, player_data = await find_player_by_name(ctx, self.store, target_name)
+        if not player_data: return
+        target_name = player_data.get("name") or target_id
 
         # 2. json 데이터를 보기 좋게 변환하여 출력 (이하 로직 동일)
-        data_str = json.dumps(player_data, indent=4, ensure_ascii=False)
+        data_str = json.dumps(player_data.to_dict(), indent=4, ensure_ascii=False)
         
         if len(data_str) > 1900:
             await ctx.send(f"📄 **{target_name}**님의 데이터가 너무 길어 여러 부분으로 나누어 표시합니다.")
@@ -920,24 +794,35 @@ class GrowthCog(commands.Cog):
             print(f"!데이터조회 명령어 오류 발생: {error}")
             await ctx.send("명령어 처리 중 알 수 없는 오류가 발생했습니다.")
 
+    @commands.command(name="데이터내보내기")
+    @commands.is_owner()
+    async def export_user_data(self, ctx, *, target_name: str = None):
+        """[관리자용] 플레이어 데이터를 보기 좋은 JSON 파일로 내보냅니다. (이름을 생략하면 전체)"""
+        if target_name:
+            target_id, player_data = await find_player_by_name(ctx, self.store, target_name)
+            if not player_data: return
+            payload = PrettyJsonCodec().encode({target_id: player_data.to_dict()})
+            filename = f"player_{target_id}.json"
+        else:
+            payload = await self.store.export(PrettyJsonCodec())
+            filename = "player_data_export.json"
+
+        await ctx.send(f"📄 플레이어 데이터를 내보냈습니다. ({len(payload) / 1024:.1f} KB)", file=discord.File(io.BytesIO(payload), filename=filename))
+
+    @export_user_data.error
+    async def export_user_data_error(self, ctx, error):
+        if isinstance(error, commands.NotOwner):
+            await ctx.send("이 명령어는 봇 소유자만 사용할 수 있습니다.")
+
     @commands.command(name="성장관리")
     @commands.is_owner() # 봇 소유자만 실행 가능
     async def manage_growth(self, ctx, target_name: str, stat_type: str, value_str: str):
         """[관리자용] 등록된 이름으로 유저의 스탯을 관리합니다."""
         
-        all_data = load_data()
-        
-        # 1. 이름으로 플레이어 찾기
-        target_id = None
-        target_data = None
-        for player_id, player_info in all_data.items():
-            if player_info.get("name") == target_name:
-                target_id = player_id
-                target_data = player_info
-                break
-        
-        if not target_data:
-            return await ctx.send(f"'{target_name}' 이름을 가진 플레이어를 찾을 수 없습니다.")
+        # 1. 이름으로 플레이어 찾기 (이름 인덱스 사용, 동명이인이면 안내 후 종료)
+        target_id, target_data = await find_player_by_name(ctx, self.store, target_name)
+        if not target_data: return
+        target_name = target_data.get("name") or target_id
 
         # 2. 스탯 종류 확인
         stat_map = {"정신": "mental", "육체": "physical"}
@@ -956,15 +841,11 @@ class GrowthCog(commands.Cog):
             return await ctx.send("잘못된 값 형식입니다. `+5`, `-10` 과 같은 형식으로 입력해주세요.")
 
         # 4. 스탯 수정 및 저장
-        original_stat = target_data.get(stat_key, 0)
-        
-        if sign == '+':
-            new_stat = original_stat + amount
-        else: # '-'
-            new_stat = max(0, original_stat - amount) # 스탯이 0 미만이 되지 않도록 보정
-
-        all_data[target_id][stat_key] = new_stat
-        save_data(all_data)
+        async with self.store.transaction(target_id, actor=audit_actor(ctx)) as tx:
+            original_stat = tx.get(target_id).get(stat_key, 0)
+            delta = amount if sign == '+' else -amount
+            new_stat = max(0, original_stat + delta) # 스탯이 0 미만이 되지 않도록 보정
+            tx.incr(target_id, stat_key, delta, minimum=0)
 
         # 5. 결과 알림
         embed = discord.Embed(
@@ -996,18 +877,10 @@ class GrowthCog(commands.Cog):
     async def change_base_class(self, ctx, target_name: str, *, new_base_class: str):
         """[관리자용] 유저를 기본 직업 중 하나로 되돌립니다."""
         
-        all_data = load_data()
-        
-        # 1. 이름으로 플레이어 찾기
-        target_id, target_data = None, None
-        for player_id, player_info in all_data.items():
-            if player_info.get("name") == target_name.strip('"'):
-                target_id = player_id
-                target_data = player_info
-                break
-        
-        if not target_data:
-            return await ctx.send(f"'{target_name}' 이름을 가진 플레이어를 찾을 수 없습니다.")
+        # 1. 이름으로 플레이어 찾기 (이름 인덱스 사용, 동명이인이면 안내 후 종료)
+        target_id, target_data = await find_player_by_name(ctx, self.store, target_name)
+        if not target_data: return
+        target_name = target_data.get("name") or target_id
 
         # 2. 변경하려는 기본 직업이 유효한지 확인
         if new_base_class not in self.CLASSES:
@@ -1017,10 +890,10 @@ class GrowthCog(commands.Cog):
         # 3. 데이터 업데이트 (전직 정보 초기화)
         old_class = target_data.get("class", "없음")
         
-        all_data[target_id]["class"] = new_base_class
-        all_data[target_id]["advanced_class"] = None
-        all_data[target_id]["attribute"] = None
-        save_data(all_data)
+        async with self.store.transaction(target_id, actor=audit_actor(ctx)) as tx:
+            tx.set(target_id, "class", new_base_class)
+            tx.set(target_id, "advanced_class", None)
+            tx.set(target_id, "attribute", None)
 
         # 4. 결과 알림
         embed = discord.Embed(
@@ -1047,41 +920,17 @@ class GrowthCog(commands.Cog):
     @commands.command(name="데이터점검")
     @commands.is_owner()
     async def fix_data_structure(self, ctx):
-        """[관리자용] 모든 유저 데이터의 구조를 최신 상태로 업데이트하고 정리합니다."""
-        await ctx.send("모든 유저 데이터 구조 점검 및 업데이트를 시작합니다...")
-        
-        all_data = load_data()
-        updated_users = 0
-        today_kst_str = datetime.now(self.KST).strftime('%Y-%m-%d')
-
-        for player_id, player_data in all_data.items():
-            is_updated_this_loop = False
-            
-            # ▼▼▼ 'updated'를 'is_updated_this_loop'로 통일했습니다 ▼▼▼
-            if 'timezone' not in player_data:
-                player_data.setdefault('timezone', None)
-                is_updated_this_loop = True
-
-            if 'last_goal_date' in player_data and 'daily_goal_info' not in player_data:
-                last_date = player_data['last_goal_date']
-                count = 1 if last_date == today_kst_str else 0
-                player_data['daily_goal_info'] = {'date': last_date, 'count': count}
-                del player_data['last_goal_date']
-                is_updated_this_loop = True
-
-            if 'last_daily_reset_date' not in player_data:
-                player_data.setdefault('last_daily_reset_date', "2000-01-01")
-                is_updated_this_loop = True
-
-            if 'attribute' not in player_data:
-                player_data.setdefault('attribute', None)
-                is_updated_this_loop = True
-            
-            if is_updated_this_loop:
-                updated_users += 1
-
-        save_data(all_data)
-        await ctx.send(f"✅ 완료! 총 {len(all_data)}명의 유저 중 {updated_users}명의 데이터 구조를 업데이트했습니다.")
+        """[관리자용] 유저 데이터 구조(스키마) 업그레이드 현황을 확인합니다.
+
+        업그레이드는 각 유저 데이터가 처음 조회될 때와 백그라운드 작업에서 자동으로 진행됩니다.
+        """
+        pending = self.store.outdated_count
+        if not pending:
+            return await ctx.send(f"✅ 총 {len(self.store)}명의 유저 데이터가 모두 최신 구조(v{SCHEMA_VERSION})입니다.")
+        started = self.store.start_migration()
+        self.store.note(audit_actor(ctx), f"스키마 업그레이드 대기 {pending}명 확인")
+        status = "백그라운드 업그레이드를 시작했습니다." if started else "백그라운드 업그레이드가 진행 중입니다."
+        await ctx.send(f"🔧 총 {len(self.store)}명의 유저 중 {pending}명이 아직 이전 구조입니다. {status}")
 
 # cogs/growth.py 의 GrowthCog 클래스 내부에 추가
 
@@ -1090,18 +939,10 @@ class GrowthCog(commands.Cog):
     async def manage_attribute(self, ctx, target_name: str, *, new_attribute: str):
         """[관리자용] 등록된 이름으로 유저의 속성을 변경하거나 제거합니다."""
         
-        all_data = load_data()
-        
-        # 1. 이름으로 플레이어 찾기
-        target_id, target_data = None, None
-        for player_id, player_info in all_data.items():
-            if player_info.get("name") == target_name.strip('"'):
-                target_id = player_id
-                target_data = player_info
-                break
-        
-        if not target_data:
-            return await ctx.send(f"'{target_name}' 이름을 가진 플레이어를 찾을 수 없습니다.")
+        # 1. 이름으로 플레이어 찾기 (이름 인덱스 사용, 동명이인이면 안내 후 종료)
+        target_id, target_data = await find_player_by_name(ctx, self.store, target_name)
+        if not target_data: return
+        target_name = target_data.get("name") or target_id
 
         # 2. 새로운 속성 값 유효성 검사
         valid_attributes = ["Gut", "Wit", "Heart", "없음"]
@@ -1114,15 +955,14 @@ class GrowthCog(commands.Cog):
         # 3. 데이터 업데이트
         old_attribute = target_data.get("attribute") or "없음"
         
-        if normalized_new_attribute == "없음":
-            all_data[target_id]["attribute"] = None
-        else:
-            all_data[target_id]["attribute"] = normalized_new_attribute
-            
-        save_data(all_data)
+        async with self.store.transaction(target_id, actor=audit_actor(ctx)) as tx:
+            if normalized_new_attribute == "없음":
+                tx.set(target_id, "attribute", None)
+            else:
+                tx.set(target_id, "attribute", normalized_new_attribute)
 
         # 4. 결과 알림
-        final_attribute = all_data[target_id]["attribute"] or "없음"
+        final_attribute = target_data["attribute"] or "없음"
         embed = discord.Embed(
             title="✨ 속성 관리 완료",
             description=f"**{target_name}**님의 속성을 성공적으로 수정했습니다.",
@@ -2,34 +2,52 @@
 
 import discord
 from discord.ext import commands
-import json
-import os
 import aiohttp
+import asyncio
 import random
+from core.storage import DataFile
 
 # --- 데이터 관리 함수 ---
+PROFILES_FILE = DataFile("profiles.json")
+
 def load_profiles():
-    if not os.path.exists("profiles.json"): return {}
-    with open("profiles.json", 'r', encoding='utf-8') as f: return json.load(f)
+    return PROFILES_FILE.load()
+
+async def save_profiles(data):
+    # 저장은 스레드에서 직렬화되므로 캐시와 분리된 사본을 넘깁니다.
+    await PROFILES_FILE.save({name: dict(profile) for name, profile in data.items()})
 
-def save_profiles(data):
-    with open("profiles.json", 'w', encoding='utf-8') as f: json.dump(data, f, indent=4, ensure_ascii=False)
+# --- 웹훅 연결 설정 ---
+# 웹훅은 모두 discord.com 한 곳으로 가므로, 호스트당 연결 수를 제한하고 연결을 재사용합니다.
+WEBHOOK_CONNECTIONS_PER_HOST = 10
+WEBHOOK_KEEPALIVE_SECONDS = 60
+WEBHOOK_TIMEOUT = aiohttp.ClientTimeout(total=15)
 
 # --- Roleplay Cog 클래스 ---
 class RoleplayCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.session = aiohttp.ClientSession()
+        self.session = None
+        # 프로필 캐시. !프로필생성/수정/삭제만 바꾸고, 바뀔 때마다 파일에도 저장합니다.
+        self.profiles = {}
+
+    async def cog_load(self):
+        self.profiles = await asyncio.to_thread(load_profiles)
+        # 이벤트 루프 안에서 세션을 만들어야 하므로 __init__ 대신 여기서 생성
+        connector = aiohttp.TCPConnector(limit_per_host=WEBHOOK_CONNECTIONS_PER_HOST,
+                                         keepalive_timeout=WEBHOOK_KEEPALIVE_SECONDS)
+        self.session = aiohttp.ClientSession(connector=connector, timeout=WEBHOOK_TIMEOUT)
 
     async def cog_unload(self):
-        await self.session.close()
+        if self.session:
+            await self.session.close()
 
     @commands.command(name="프로필생성")
     @commands.is_owner()
     async def create_profile(self, ctx, name: str, avatar_url: str, webhook_url: str):
         """새로운 가상 프로필을 등록합니다. !프로필생성 <이름> <이미지URL> <웹훅URL>"""
         webhook_url = webhook_url.strip('<>')
-        profiles = load_profiles()
+        profiles = self.profiles
         if name in profiles:
             return await ctx.send(f"이미 '{name}' 이름의 프로필이 존재합니다.")
         
@@ -41,7 +59,7 @@ class RoleplayCog(commands.Cog):
             "avatar_url": avatar_url,
             "webhook_url": webhook_url
         }
-        save_profiles(profiles)
+        await save_profiles(profiles)
         await ctx.send(f"✅ 프로필 '{name}'이(가) 성공적으로 생성되었습니다.")
 
 
@@ -52,7 +70,7 @@ class RoleplayCog(commands.Cog):
     async def edit_profile(self, ctx, name: str, item_to_edit: str, *, new_value: str):
         """기존 프로필의 정보를 수정합니다. !프로필수정 <이름> <항목> <새 값>"""
         
-        profiles = load_profiles()
+        profiles = self.profiles
         if name not in profiles:
             return await ctx.send(f"'{name}' 이름의 프로필을 찾을 수 없습니다.")
 
@@ -83,7 +101,7 @@ class RoleplayCog(commands.Cog):
         else:
             return await ctx.send("수정할 수 있는 항목은 `이름`, `이미지`, `웹훅` 입니다.")
 
-        save_profiles(profiles)
+        await save_profiles(profiles)
 
     @edit_profile.error
     async def edit_profile_error(self, ctx, error):
@@ -96,12 +114,12 @@ class RoleplayCog(commands.Cog):
     @commands.is_owner()
     async def delete_profile(self, ctx, *, name: str):
         """기존 가상 프로필을 삭제합니다."""
-        profiles = load_profiles()
+        profiles = self.profiles
         if name not in profiles:
             return await ctx.send(f"'{name}' 이름의 프로필을 찾을 수 없습니다.")
         
         del profiles[name]
-        save_profiles(profiles)
+        await save_profiles(profiles)
         await ctx.send(f"🗑️ 프로필 '{name}'이(가) 삭제되었습니다.")
 
     @commands.command(name="rp", aliases=["인물"])
@@ -112,8 +130,7 @@ class RoleplayCog(commands.Cog):
         except ValueError:
             await ctx.message.delete(); return await ctx.send("잘못된 형식입니다. `!rp <이름>: <할 말>` 형식으로 입력해주세요.", delete_after=10)
 
-        profiles = load_profiles()
-        profile = profiles.get(name)
+        profile = self.profiles.get(name)
         if not profile:
             await ctx.message.delete(); return await ctx.send(f"'{name}' 프로필을 찾을 수 없습니다.", delete_after=10)
 
@@ -2,19 +2,10 @@
 
 import discord
 from discord.ext import commands
-import json
-import os
+from core.lookup import audit_actor, find_player_by_name
 import asyncio
 import random
 
-# --- 데이터 관리 함수 ---
-def load_data():
-    if not os.path.exists("player_data.json"): return {}
-    with open("player_data.json", 'r', encoding='utf-8') as f: return json.load(f)
-
-def save_data(data):
-    with open("player_data.json", 'w', encoding='utf-8') as f: json.dump(data, f, indent=4, ensure_ascii=False)
-
 # --- 아이템 정보 (모든 이름에서 띄어쓰기 제거) ---
 SHOP_ITEMS = {
     "알사탕": {"price": 5, "description": "없는 맛이 없는 알사탕. 주머니에 넣어두면 마음이 든든하다."},
@@ -53,20 +44,19 @@ ITEM_USAGE_TEXT = {
 class SchoolCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-
-
+        self.store = bot.store
+        self.conversations = bot.conversations # '예' 확인 대기는 대화 목록(core.conversations)으로
 
     @commands.command(name="주머니")
     async def pocket(self, ctx):
-        all_data = load_data()
-        player_data = all_data.get(str(ctx.author.id))
+        player_data = self.store.get(ctx.author.id)
         if not player_data or not player_data.get("registered"):
             return await ctx.send("먼저 `!등록`을 진행해주세요.")
 
         points = player_data.get("school_points", 0)
         inventory = player_data.get("inventory", [])
         
-        embed = discord.Embed(title=f"🎒 {player_data['name']}의 주머니", color=int(player_data['color'][1:], 16))
+        embed = discord.Embed(title=f"🎒 {player_data['name']}의 주머니", color=player_data.color_value)
         embed.add_field(name="🎓 스쿨 포인트", value=f"`{points}` P", inline=False)
         item_list = "\n".join(f"- {item}" for item in inventory) if inventory else "아직 아이템이 없습니다."
         embed.add_field(name=f"📦 보유 아이템 ({len(inventory)}/10)", value=item_list, inline=False)
@@ -86,8 +76,7 @@ class SchoolCog(commands.Cog):
         if item_name not in SHOP_ITEMS:
             return await ctx.send("교내상점에서 판매하지 않는 아이템입니다. (시장의 경우 `!시장구매`)")
         
-        all_data = load_data()
-        player_data = all_data.get(str(ctx.author.id))
+        player_data = self.store.get(ctx.author.id)
         if not player_data: return await ctx.send("먼저 `!등록`을 진행해주세요.")
 
         item_info = SHOP_ITEMS[item_name]
@@ -97,27 +86,34 @@ class SchoolCog(commands.Cog):
         if len(inventory) >= 8: return await ctx.send("주머니가 가득 차서 더 이상 아이템을 구매할 수 없습니다.")
         if points < item_info['price']: return await ctx.send("스쿨 포인트가 부족합니다.")
 
-        embed = discord.Embed(title="🛒 구매 확인", description=item_info['description'], color=int(player_data['color'][1:], 16))
+        embed = discord.Embed(title="🛒 구매 확인", description=item_info['description'], color=player_data.color_value)
         embed.add_field(name="아이템", value=item_name, inline=True); embed.add_field(name="가격", value=f"`{item_info['price']}` P", inline=True); embed.add_field(name="구매 후 포인트", value=f"`{points - item_info['price']}` P", inline=True)
         embed.set_footer(text="구매하시려면 30초 안에 '예'를 입력해주세요.")
-        await ctx.send(embed=embed)
-
-        def check(m): return m.author == ctx.author and m.channel == ctx.channel and m.content.lower() == '예'
-        try: await self.bot.wait_for('message', check=check, timeout=30.0)
-        except asyncio.TimeoutError: return await ctx.send("시간이 초과되어 구매가 취소되었습니다.")
-
-        player_data['school_points'] -= item_info['price']
-        inventory.append(item_name)
-        player_data['inventory'] = inventory
-        save_data(all_data)
+        convo = await self.conversations.begin(ctx)
+        if not convo: return
+        with convo:
+            await ctx.send(embed=embed)
+            try: await convo.ask(lambda m: m.content.lower() == '예', timeout=30.0)
+            except asyncio.TimeoutError: return await ctx.send("시간이 초과되어 구매가 취소되었습니다.")
+
+        # 확인을 기다리는 동안 바뀌었을 수 있으므로 최신 데이터로 다시 검사한 뒤 차감
+        # 잠금을 잡은 동안에는 답장을 보내지 않고, 보낼 내용만 정해 둠
+        async with self.store.transaction(ctx.author.id) as tx:
+            player_data = tx.get(ctx.author.id)
+            if len(player_data.get("inventory", [])) >= 8: error = "주머니가 가득 차서 더 이상 아이템을 구매할 수 없습니다."
+            elif player_data.get("school_points", 0) < item_info['price']: error = "스쿨 포인트가 부족합니다."
+            else:
+                error = None
+                tx.incr(ctx.author.id, 'school_points', -item_info['price'])
+                tx.append(ctx.author.id, 'inventory', item_name)
+        if error: return await ctx.send(error)
         await ctx.send(f"**{item_name}** 구매를 완료했습니다!")
 
     @commands.command(name="버리기")
     async def discard_item(self, ctx, *, item_name_input: str):
 
         item_name = item_name_input.replace(" ", "")
-        all_data = load_data()
-        player_data = all_data.get(str(ctx.author.id))
+        player_data = self.store.get(ctx.author.id)
         if not player_data: return await ctx.send("먼저 `!등록`을 진행해주세요.")
 
         inventory = player_data.get("inventory", [])
@@ -125,15 +121,17 @@ class SchoolCog(commands.Cog):
 
         embed = discord.Embed(title="🗑️ 아이템 버리기 확인", description=f"정말로 **{item_name}** 아이템을 버리시겠습니까?\n버린 아이템은 되찾을 수 없습니다.", color=discord.Color.red())
         embed.set_footer(text="동의하시면 30초 안에 '예'를 입력해주세요.")
-        await ctx.send(embed=embed)
-
-        def check(m): return m.author == ctx.author and m.channel == ctx.channel and m.content.lower() == '예'
-        try: await self.bot.wait_for('message', check=check, timeout=30.0)
-        except asyncio.TimeoutError: return await ctx.send("시간이 초과되어 아이템 버리기가 취소되었습니다.")
-
-        inventory.remove(item_name)
-        player_data["inventory"] = inventory
-        save_data(all_data)
+        convo = await self.conversations.begin(ctx)
+        if not convo: return
+        with convo:
+            await ctx.send(embed=embed)
+            try: await convo.ask(lambda m: m.content.lower() == '예', timeout=30.0)
+            except asyncio.TimeoutError: return await ctx.send("시간이 초과되어 아이템 버리기가 취소되었습니다.")
+
+        async with self.store.transaction(ctx.author.id) as tx:
+            owned = item_name in tx.get(ctx.author.id).get("inventory", [])
+            if owned: tx.remove(ctx.author.id, "inventory", item_name)
+        if not owned: return await ctx.send(f"'{item_name}' 아이템을 가지고 있지 않습니다.")
         await ctx.send(f"**{item_name}** 아이템을 성공적으로 버렸습니다.")
 
     @commands.command(name="선물")
@@ -141,30 +139,30 @@ class SchoolCog(commands.Cog):
         item_name = item_name_input.replace(" ", "")
         if ctx.author == target_user: return await ctx.send("자기 자신에게는 선물을 보낼 수 없습니다.")
             
-        all_data = load_data()
-        sender_data, receiver_data = all_data.get(str(ctx.author.id)), all_data.get(str(target_user.id))
-        if not sender_data or not receiver_data: return await ctx.send("선물을 보내거나 받는 사람 중 등록되지 않은 유저가 있습니다.")
-
-        sender_inventory = sender_data.get("inventory", [])
-        if item_name not in sender_inventory: return await ctx.send(f"'{item_name}' 아이템을 가지고 있지 않습니다.")
-
-        receiver_inventory = receiver_data.get("inventory", [])
-        if len(receiver_inventory) >= 8: return await ctx.send(f"{target_user.display_name}님의 주머니가 가득 차서 선물을 보낼 수 없습니다.")
-        
-        sender_inventory.remove(item_name)
-        receiver_inventory.append(item_name)
-        save_data(all_data)
+        async with self.store.transaction(ctx.author.id, target_user.id) as tx:
+            sender_data, receiver_data = tx.get(ctx.author.id), tx.get(target_user.id)
+            if not sender_data or not receiver_data: error = "선물을 보내거나 받는 사람 중 등록되지 않은 유저가 있습니다."
+            elif item_name not in sender_data.get("inventory", []): error = f"'{item_name}' 아이템을 가지고 있지 않습니다."
+            elif len(receiver_data.get("inventory", [])) >= 8: error = f"{target_user.display_name}님의 주머니가 가득 차서 선물을 보낼 수 없습니다."
+            else:
+                error = None
+                tx.remove(ctx.author.id, "inventory", item_name)
+                tx.append(target_user.id, "inventory", item_name)
+        if error: return await ctx.send(error)
         await ctx.send(f"🎁 {target_user.display_name}님에게 **{item_name}**을(를) 선물했습니다!")
 
     @commands.command(name="사용")
     async def use_item(self, ctx, *, item_name_input: str):
         item_name = item_name_input.replace(" ", "")
-        all_data = load_data()
-        player_data = all_data.get(str(ctx.author.id))
-        if not player_data: return await ctx.send("먼저 `!등록`을 진행해주세요.")
-
-        inventory = player_data.get("inventory", [])
-        if item_name not in inventory: return await ctx.send(f"'{item_name}' 아이템을 가지고 있지 않습니다.")
+        async with self.store.transaction(ctx.author.id) as tx:
+            player_data = tx.get(ctx.author.id)
+            if not player_data: error = "먼저 `!등록`을 진행해주세요."
+            elif item_name not in player_data.get("inventory", []): error = f"'{item_name}' 아이템을 가지고 있지 않습니다."
+            else:
+                error = None
+                if item_name not in PERMANENT_ITEMS:
+                    tx.remove(ctx.author.id, "inventory", item_name)
+        if error: return await ctx.send(error)
         
         usage_text_source = ITEM_USAGE_TEXT.get(item_name)
         if isinstance(usage_text_source, list):
@@ -172,11 +170,9 @@ class SchoolCog(commands.Cog):
         else:
             usage_text = usage_text_source or f"**{item_name}**을(를) 어떻게 사용해야 할지 감이 오지 않는다..."
 
-        embed = discord.Embed(description=usage_text, color=int(player_data['color'][1:], 16))
+        embed = discord.Embed(description=usage_text, color=player_data.color_value)
         
         if item_name not in PERMANENT_ITEMS:
-            inventory.remove(item_name)
-            save_data(all_data)
             embed.set_footer(text=f"사용한 {item_name} 아이템이 사라졌습니다.")
         await ctx.send(embed=embed)
 
@@ -187,20 +183,10 @@ class SchoolCog(commands.Cog):
     async def manage_school_points(self, ctx, target_name: str, value_str: str):
         """[관리자용] 등록된 이름으로 유저의 스쿨 포인트를 관리합니다."""
         
-        all_data = load_data()
-        
-        # 1. 이름으로 플레이어 찾기
-        target_id = None
-        target_data = None
-        for player_id, player_info in all_data.items():
-            # 이름에 띄어쓰기가 있는 경우를 대비해 따옴표를 제거
-            if player_info.get("name") == target_name.strip('"'):
-                target_id = player_id
-                target_data = player_info
-                break
-        
-        if not target_data:
-            return await ctx.send(f"'{target_name}' 이름을 가진 플레이어를 찾을 수 없습니다.")
+        # 1. 이름으로 플레이어 찾기 (이름 인덱스 사용, 동명이인이면 안내 후 종료)
+        target_id, target_data = await find_player_by_name(ctx, self.store, target_name)
+        if not target_data: return
+        target_name = target_data.get("name") or target_id
 
         # 2. 값 파싱 (+/- 숫자)
         try:
@@ -212,15 +198,11 @@ class SchoolCog(commands.Cog):
             return await ctx.send("잘못된 값 형식입니다. `+50`, `-30` 과 같은 형식으로 입력해주세요.")
 
         # 3. 스쿨 포인트 수정 및 저장
-        original_points = target_data.get('school_points', 0)
-        
-        if sign == '+':
-            new_points = original_points + amount
-        else: # '-'
-            new_points = max(0, original_points - amount) # 포인트가 0 미만이 되지 않도록 보정
-
-        all_data[target_id]['school_points'] = new_points
-        save_data(all_data)
+        async with self.store.transaction(target_id, actor=audit_actor(ctx)) as tx:
+            original_points = tx.get(target_id).get('school_points', 0)
+            delta = amount if sign == '+' else -amount
+            new_points = max(0, original_points + delta) # 포인트가 0 미만이 되지 않도록 보정
+            tx.incr(target_id, 'school_points', delta, minimum=0)
 
         # 4. 결과 알림
         embed = discord.Embed(
@@ -0,0 +1,2 @@
+# core/__init__.py
+# 여러 Cog가 함께 사용하는 공용 모듈 모음 (cogs 폴더에 두면 확장으로 로드되므로 분리)
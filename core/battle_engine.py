@@ -0,0 +1,427 @@
+# core/battle_engine.py
+"""디스코드와 무관한 전투 규칙.
+
+상태(BattleState)에 행동(Move, Attack, ...)을 apply() 하면 상태가 바뀌고, 그 결과를
+Event 목록으로 돌려줍니다. 메시지 전송, 현황판, 보상 지급은 호출하는 쪽(cogs/battle.py)이 담당합니다.
+규칙에 맞지 않는 행동은 ActionError(사용자에게 보여줄 문구)를 발생시키고 상태를 바꾸지 않습니다.
+"""
+
+import random
+from dataclasses import asdict, dataclass, field
+
+from core.grid import DIRECTIONS, Grid
+
+EMPTY_CELL = "□"
+ACTIONS_PER_TURN = 2
+SPECIAL_COOLDOWN = 2
+# 밸런스 수치 (tools.simulate --set 으로 바꿔서 시뮬레이션해 볼 수 있음)
+CRIT_CHANCE = 0.10
+CRIT_MULTIPLIER = 2.0
+BUFF_MULTIPLIER = 1.5       # 마검사/검사 특수 능력으로 강화된 공격
+WIT_MULTIPLIER = 3          # Wit 스킬의 상성 효과 배율
+HEART_HEAL_RATIO = 0.3      # Heart 스킬의 최대 체력 대비 회복량
+# 직업별 공격 사거리 (최소, 최대 거리)
+CLASS_RANGES = {'마법사': (2, 3), '마검사': (1, 3), '검사': (1, 1)}
+ATTRIBUTE_ADVANTAGE = {'Wit': 'Gut', 'Gut': 'Heart', 'Heart': 'Wit'}
+
+
+class ActionError(Exception):
+    """규칙상 할 수 없는 행동. 메시지는 그대로 사용자에게 보여줍니다."""
+
+
+# --- 상태 ---
+@dataclass(slots=True)
+class Fighter:
+    id: int
+    name: str
+    emoji: str
+    player_class: str
+    level: int
+    mental: int
+    physical: int
+    max_hp: int
+    current_hp: int
+    team: str = "A"
+    attribute: str = None
+    advanced_class: str = None
+    color: int = 0xFFFFFF
+    pos: int = -1
+    defense: int = 0
+    special_cooldown: int = 0
+    attack_buff_stacks: int = 0
+    effects: dict = field(default_factory=dict)
+
+    @property
+    def alive(self):
+        return self.current_hp > 0
+
+    @property
+    def display_class(self):
+        return self.advanced_class or self.player_class
+
+    @classmethod
+    def from_player(cls, player_id, player, hp_bonus=0):
+        """PlayerRecord(또는 같은 속성을 가진 객체)로 전투용 능력치를 만듭니다."""
+        max_hp = max(1, player.level * 10 + player.physical) + hp_bonus
+        return cls(id=player_id, name=player.name, emoji=player.emoji, player_class=player.player_class,
+                   level=player.level, mental=player.mental, physical=player.physical,
+                   max_hp=max_hp, current_hp=max_hp, attribute=player.attribute,
+                   advanced_class=player.advanced_class, color=player.color_value)
+
+
+@dataclass(slots=True)
+class BattleState:
+    fighters: dict              # {플레이어 ID: Fighter}
+    teams: dict                 # {"A": [ID, ...], "B": [ID, ...]}
+    turn_order: list
+    turn_index: int = 0
+    actions_left: int = ACTIONS_PER_TURN
+    winner: str = None          # 끝난 전투의 승리 팀
+    grid: Grid = field(default_factory=Grid.get)
+
+    @property
+    def is_team_battle(self):
+        return len(self.teams["A"]) > 1
+
+    @property
+    def current_id(self):
+        return self.turn_order[self.turn_index]
+
+    @property
+    def current(self):
+        return self.fighters[self.current_id]
+
+    def enemy_team(self, team):
+        return "B" if team == "A" else "A"
+
+    def board_cells(self):
+        cells = [EMPTY_CELL] * self.grid.size
+        for fighter in self.fighters.values():
+            if fighter.alive: cells[fighter.pos] = fighter.emoji
+        return cells
+
+    def occupied_mask(self, exclude_id=None):
+        """살아 있는 참가자(exclude_id 제외)가 있는 칸의 비트마스크"""
+        mask = 0
+        for f in self.fighters.values():
+            if f.alive and f.id != exclude_id: mask |= 1 << f.pos
+        return mask
+
+
+def state_to_dict(state):
+    """체크포인트 저장용. 기본 자료형(dict/list/int/str)만으로 된 사본"""
+    return {"fighters": [asdict(f) for f in state.fighters.values()],
+            "teams": {team: list(ids) for team, ids in state.teams.items()},
+            "turn_order": list(state.turn_order), "turn_index": state.turn_index,
+            "actions_left": state.actions_left, "winner": state.winner,
+            "map": [state.grid.rows, state.grid.cols]}
+
+
+def state_from_dict(data):
+    fighters = [Fighter(**f) for f in data["fighters"]]
+    return BattleState(fighters={f.id: f for f in fighters},
+                       teams={team: list(ids) for team, ids in data["teams"].items()},
+                       turn_order=list(data["turn_order"]), turn_index=data["turn_index"],
+                       actions_left=data["actions_left"], winner=data["winner"], grid=Grid.get(*data["map"]))
+
+
+# --- 행동 ---
+@dataclass(frozen=True, slots=True)
+class Move:
+    actor: int
+    directions: tuple
+
+
+@dataclass(frozen=True, slots=True)
+class Attack:
+    actor: int
+    target: int = None
+
+
+@dataclass(frozen=True, slots=True)
+class Special:
+    actor: int
+    target_pos: int = None  # 마법사 텔레포트 위치 (0부터)
+
+
+@dataclass(frozen=True, slots=True)
+class Skill:
+    actor: int
+
+
+@dataclass(frozen=True, slots=True)
+class Forfeit:
+    actor: int
+
+
+@dataclass(frozen=True, slots=True)
+class Timeout:
+    actor: int
+
+
+# --- 결과 ---
+@dataclass(frozen=True, slots=True)
+class Event:
+    kind: str       # "log" | "turn_over" | "turn" | "end"
+    text: str = ""
+    winner: str = None
+
+
+def log(text):
+    return Event("log", text)
+
+
+# --- 전투 준비 ---
+def new_battle(team_a, team_b, rng=random, grid=None):
+    """팀별 Fighter 목록으로 전투를 시작합니다. (1:1이면 팀마다 한 명) 시작 이벤트도 함께 반환"""
+    grid = grid or Grid.get()
+    top_left, bottom_left, top_right, bottom_right = grid.corners()
+    for team, fighters in (("A", team_a), ("B", team_b)):
+        for fighter in fighters: fighter.team = team
+    events = []
+    if len(team_a) == 1:
+        positions = rng.sample([top_left, bottom_right], 2)
+        team_a[0].pos, team_b[0].pos = positions
+        turn_order = [team_a[0].id, team_b[0].id]
+        rng.shuffle(turn_order)
+    else:
+        team_a[0].pos, team_a[1].pos, team_b[0].pos, team_b[1].pos = top_left, bottom_left, top_right, bottom_right
+        if rng.random() < 0.5:
+            turn_order = [team_a[0].id, team_b[0].id, team_a[1].id, team_b[1].id]
+            events.append(log("▶️ A팀이 선공입니다!"))
+        else:
+            turn_order = [team_b[0].id, team_a[0].id, team_b[1].id, team_a[1].id]
+            events.append(log("▶️ B팀이 선공입니다!"))
+    state = BattleState(fighters={f.id: f for f in team_a + team_b},
+                        teams={"A": [f.id for f in team_a], "B": [f.id for f in team_b]},
+                        turn_order=turn_order, grid=grid)
+    if state.is_team_battle:
+        events.append(log(f"▶️ {state.current.name}의 턴입니다."))
+    return state, events
+
+
+def next_turn(state):
+    """현재 플레이어의 쿨타임을 줄이고, 쓰러지지 않은 다음 플레이어에게 턴을 넘깁니다."""
+    current = state.current
+    if current.special_cooldown > 0:
+        current.special_cooldown -= 1
+    for _ in range(len(state.turn_order)):
+        state.turn_index = (state.turn_index + 1) % len(state.turn_order)
+        if state.current.alive: break
+    state.actions_left = ACTIONS_PER_TURN
+    return [Event("turn", f"▶️ {state.current.name}의 턴입니다.")]
+
+
+def teleport_cells(state, actor_id):
+    """마법사 특수 능력으로 이동할 수 있는 칸 (0부터)"""
+    grid = state.grid
+    return list(grid.cells(grid.all_mask & ~state.occupied_mask(actor_id)))
+
+
+def attack_type(fighter, dist):
+    """직업별 사거리. 공격할 수 없으면 None"""
+    low, high = CLASS_RANGES.get(fighter.player_class, (1, 0))
+    if not low <= dist <= high: return None
+    return "근거리" if dist == 1 else "원거리"
+
+
+def targets_in_range(state, actor):
+    """actor의 사거리 안에 있는 살아 있는 적들"""
+    low, high = CLASS_RANGES.get(actor.player_class, (1, 0))
+    mask = state.grid.range_mask(actor.pos, low, high)
+    return [state.fighters[pid] for pid in state.teams[state.enemy_team(actor.team)]
+            if state.fighters[pid].alive and mask >> state.fighters[pid].pos & 1]
+
+
+# --- 행동 적용 ---
+def apply(state, action, rng=random):
+    """행동 하나를 적용하고 발생한 이벤트 목록을 반환합니다."""
+    if state.winner is not None:
+        raise ActionError("이미 끝난 전투입니다.")
+    if isinstance(action, Forfeit):
+        return _forfeit(state, action.actor)
+    if isinstance(action, Timeout):
+        if action.actor != state.current_id:
+            raise ActionError("이미 턴이 넘어갔습니다.")
+        loser = state.fighters[action.actor]
+        return _end(state, state.enemy_team(loser.team), f"시간 초과로 {loser.name}님이 패배했습니다.")
+
+    _check_turn(state, action.actor)
+    actor = state.current
+    if isinstance(action, Move): events = _move(state, actor, action.directions)
+    elif isinstance(action, Attack): events = _attack(state, actor, action.target, rng)
+    elif isinstance(action, Special): events = _special(state, actor, action.target_pos)
+    elif isinstance(action, Skill): events = _skill(state, actor)
+    else: raise TypeError(f"알 수 없는 행동: {action!r}")
+
+    if state.winner is None:
+        state.actions_left -= 1
+        if state.actions_left <= 0:
+            events.append(Event("turn_over", "행동력을 모두 소모하여 턴을 종료합니다."))
+    return events
+
+
+def _move(state, actor, directions):
+    mobility = max(1, (2 if actor.player_class == '검사' else 1) + actor.effects.get('mobility_modifier', 0))
+    if not (1 <= len(directions) <= mobility):
+        raise ActionError(f"👉 현재 이동력은 **{mobility}**입니다. 1~{mobility}개의 방향을 입력해주세요.")
+    steps = state.grid.steps
+    pos = actor.pos
+    for direction in directions:
+        key = direction.lower()
+        if key not in DIRECTIONS:
+            raise ActionError(f"'{direction}'은(는) 잘못된 방향키입니다. `w, a, s, d`만 사용해주세요.")
+        pos = steps[pos][key]
+        if pos is None:
+            raise ActionError("❌ 맵 밖으로 이동할 수 없습니다.")
+    if state.occupied_mask(actor.id) >> pos & 1:
+        raise ActionError("❌ 다른 플레이어가 있는 칸으로 이동할 수 없습니다.")
+    actor.pos = pos
+    return [log(f"🚶 {actor.name}이(가) 이동했습니다.")]
+
+
+def _pick_target(state, actor, target_id):
+    enemies = [state.fighters[pid] for pid in state.teams[state.enemy_team(actor.team)] if state.fighters[pid].alive]
+    if target_id is None:
+        if len(enemies) == 1: return enemies[0]
+        raise ActionError("공격할 상대를 지정해주세요. (`!공격 @대상`)")
+    for enemy in enemies:
+        if enemy.id == target_id: return enemy
+    raise ActionError("공격할 수 없는 대상입니다.")
+
+
+def _attack(state, actor, target_id, rng):
+    target = _pick_target(state, actor, target_id)
+    kind = attack_type(actor, state.grid.distance[actor.pos][target.pos])
+    if kind is None:
+        raise ActionError("❌ 공격 사거리가 아닙니다.")
+    if kind == "근거리": base_damage = actor.physical + rng.randint(0, actor.mental)
+    else: base_damage = actor.mental + rng.randint(0, actor.physical)
+    events = [log(apply_damage(actor, target, base_damage, rng))]
+    if target.alive:
+        return events
+    if not state.is_team_battle:
+        return events + _end(state, actor.team, f"{target.name}이(가) 공격을 받고 쓰러졌습니다!")
+    events.append(log(f"☠️ {target.name}이(가) 쓰러졌습니다!"))
+    if not any(state.fighters[pid].alive for pid in state.teams[target.team]):
+        loser_name = f"{target.team}팀"
+        events += _end(state, actor.team, f"{loser_name}이 전멸하여 {actor.team}팀이 승리했습니다!")
+    return events
+
+
+def apply_damage(attacker, target, base_damage, rng=random):
+    """치명타/상성/방어도를 반영해 피해를 주고 전투 로그 문구를 반환합니다."""
+    multiplier = 1.0
+    notes = []
+    effects = attacker.effects
+    # 1. 특수 능력 버프 또는 크리티컬 확인
+    if attacker.attack_buff_stacks > 0:
+        multiplier = BUFF_MULTIPLIER; attacker.attack_buff_stacks -= 1
+        notes.append("✨ 강화된 공격!")
+    elif effects.pop('guaranteed_crit', False): # Gut 스킬 효과
+        multiplier = CRIT_MULTIPLIER
+        notes.append("💥 치명타 확정!")
+    elif rng.random() < CRIT_CHANCE: # 기본 크리티컬
+        multiplier = CRIT_MULTIPLIER
+        notes.append("💥 치명타!")
+    total_damage = round(base_damage * multiplier)
+
+    # 2. 상성 데미지
+    if attacker.attribute and target.attribute:
+        attr_multiplier = effects.pop('attribute_multiplier', 1) # Wit 스킬 효과
+        if ATTRIBUTE_ADVANTAGE.get(attacker.attribute) == target.attribute:
+            bonus = rng.randint(0, attacker.level * 2) * attr_multiplier
+            total_damage += bonus
+            notes.append(f"👍 상성 우위 (+{bonus})")
+        elif ATTRIBUTE_ADVANTAGE.get(target.attribute) == attacker.attribute:
+            penalty = rng.randint(0, attacker.level * 2) * attr_multiplier
+            total_damage -= penalty
+            notes.append(f"👎 상성 열세 (-{penalty})")
+
+    # 3. 방어도 소모 후 최종 피해
+    defense = target.defense
+    final_damage = max(0, total_damage - defense)
+    target.defense = max(0, defense - total_damage)
+    target.current_hp = max(0, target.current_hp - final_damage)
+    message = f"💥 {attacker.name}이(가) {target.name}에게 **{final_damage}**의 피해!"
+    if notes: message += " " + " ".join(notes)
+    if defense > 0: message += f" (방어도 {defense} → {target.defense})"
+    return message
+
+
+def _check_turn(state, actor_id):
+    if actor_id != state.current_id:
+        raise ActionError("지금은 당신의 턴이 아닙니다.")
+    if state.actions_left <= 0:
+        raise ActionError("행동력이 없습니다.")
+
+
+def check_ready(state, actor_id):
+    """특수 능력/스킬을 쓸 수 있는지 미리 확인합니다. (위치 입력 등을 기다리기 전에 사용)"""
+    if state.winner is not None:
+        raise ActionError("이미 끝난 전투입니다.")
+    _check_turn(state, actor_id)
+    _check_cooldown(state.fighters[actor_id])
+
+
+def _check_cooldown(actor):
+    if actor.special_cooldown > 0:
+        raise ActionError(f"스킬/특수 능력의 쿨타임이 {actor.special_cooldown}턴 남았습니다.")
+
+
+def _special(state, actor, target_pos):
+    _check_cooldown(actor)
+    if actor.player_class == '마법사':
+        if target_pos is None or not 0 <= target_pos < state.grid.size or state.occupied_mask(actor.id) >> target_pos & 1:
+            raise ActionError("이동할 수 없는 위치입니다.")
+        actor.pos = target_pos
+        events = [log(f"✨ {actor.name}이(가) {target_pos + 1}번 위치로 텔레포트했습니다!")]
+    elif actor.player_class == '마검사':
+        actor.attack_buff_stacks = 1
+        events = [log(f"✨ {actor.name}이 검에 마력을 주입합니다! 다음 공격이 강화됩니다.")]
+    elif actor.player_class == '검사':
+        actor.current_hp = max(1, actor.current_hp - actor.level)
+        actor.attack_buff_stacks = 2
+        events = [log(f"🩸 {actor.name}이(가) 체력을 소모하여 다음 2회 공격을 강화합니다!")]
+    else:
+        raise ActionError("특수 능력이 없는 직업입니다.")
+    actor.special_cooldown = SPECIAL_COOLDOWN
+    return events
+
+
+def _skill(state, actor):
+    if not actor.attribute:
+        raise ActionError("속성을 부여받은 후에 스킬을 사용할 수 있습니다. (`!속성부여`)")
+    _check_cooldown(actor)
+    # 팀전이면 살아 있는 아군 전체, 1:1이면 자신
+    allies = [state.fighters[pid] for pid in state.teams[actor.team] if state.fighters[pid].alive]
+    if actor.attribute == "Gut":
+        for ally in allies: ally.effects['guaranteed_crit'] = True
+        events = [log(f"✊ {actor.name}이(가) Gut 속성의 스킬을 사용합니다!"), log("모든 아군의 다음 공격이 치명타로 적용됩니다!")]
+    elif actor.attribute == "Wit":
+        for ally in allies: ally.effects['attribute_multiplier'] = WIT_MULTIPLIER
+        events = [log(f"🧐 {actor.name}이(가) Wit 속성의 스킬을 사용합니다!"), log(f"모든 아군의 다음 공격 상성 효과가 {WIT_MULTIPLIER}배로 증폭됩니다!")]
+    elif actor.attribute == "Heart":
+        healed = []
+        for ally in allies:
+            heal_amount = round(ally.max_hp * HEART_HEAL_RATIO)
+            ally.current_hp = min(ally.max_hp, ally.current_hp + heal_amount)
+            healed.append(f"{ally.name}(+{heal_amount})")
+        events = [log(f"💚 {actor.name}이(가) Heart 속성의 스킬을 사용합니다!"), log(f"아군 전체의 체력이 회복되었습니다. ({', '.join(healed)})")]
+    else:
+        raise ActionError("알 수 없는 속성입니다.")
+    actor.special_cooldown = SPECIAL_COOLDOWN
+    return events
+
+
+def _forfeit(state, actor_id):
+    actor = state.fighters.get(actor_id)
+    if actor is None:
+        raise ActionError("당신은 이 전투의 참여자가 아닙니다.")
+    prefix = f"{actor.team}팀의 " if state.is_team_battle else ""
+    return _end(state, state.enemy_team(actor.team), f"{prefix}{actor.name}님이 기권했습니다.")
+
+
+def _end(state, winner_team, reason):
+    state.winner = winner_team
+    return [Event("end", reason, winner=winner_team)]
@@ -0,0 +1,59 @@
+# core/checkpoints.py
+
+import asyncio
+
+from core.storage import DataFile
+
+CHECKPOINT_FILE = "active_battles.json"
+CHECKPOINT_DELAY = 1.0  # 이 시간 동안 들어온 변경은 한 번의 저장으로 합침
+
+
+class BattleCheckpoints:
+    """진행 중인 전투의 체크포인트 (채널 ID → 기본 자료형으로 된 전투 기록).
+
+    전투는 행동마다 update()로 새 기록을 넘기기만 하고, 실제 저장은 CHECKPOINT_DELAY초 뒤
+    DataFile이 워커 스레드에서 한 번에 합니다. 봇이 다시 켜지면 load()한 기록으로 전투를 복원합니다.
+    """
+
+    def __init__(self, path=CHECKPOINT_FILE, codec=None, delay=CHECKPOINT_DELAY):
+        self.file = DataFile(path, codec)
+        self.delay = delay
+        self.records = {}
+        self._dirty = set() # 마지막 저장 이후 바뀐 전투의 채널 ID
+        self._task = None
+
+    def load(self):
+        self.records = self.file.load()
+        return self
+
+    def update(self, channel_id, record):
+        """record는 넘긴 뒤 수정하지 않는 새 dict여야 합니다. (스레드에서 직렬화하므로)"""
+        self.records[str(channel_id)] = record
+        self._request(channel_id)
+
+    def remove(self, channel_id):
+        if self.records.pop(str(channel_id), None) is not None:
+            self._request(channel_id)
+
+    def _request(self, channel_id):
+        self._dirty.add(str(channel_id))
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._save_later())
+
+    async def _save_later(self):
+        # 저장하는 동안 바뀐 전투가 있으면 한 번 더 (바뀐 것이 없을 때까지)
+        while self._dirty:
+            await asyncio.sleep(self.delay)
+            await self.flush()
+
+    async def flush(self):
+        self._dirty.clear()
+        try:
+            await self.file.save(dict(self.records))
+        except Exception as e:
+            print(f"❗️ 전투 체크포인트 저장 중 오류 발생: {e}")
+
+    async def close(self):
+        if self._task and not self._task.done():
+            self._task.cancel()
+            await self.flush()
@@ -0,0 +1,96 @@
+# core/clock.py
+
+import time as _time
+from datetime import datetime, time, timedelta
+
+import pytz
+
+DEFAULT_TIMEZONE = "Asia/Seoul"
+# 하루의 시작(일일 초기화) 시각과 도전 등록/완료 가능 시간 (현지 시각 기준)
+RESET_HOUR = 2
+REGISTRATION_HOURS = (6, 14)  # 오전 6시 ~ 오후 2시 (!정신도전, !육체도전, !휴식)
+COMPLETION_HOURS = (16, 2)    # 오후 4시 ~ 다음날 새벽 2시 (!도전완료)
+
+
+class LocalDay:
+    """한 시간대의 '하루'(오전 2시 ~ 다음날 오전 2시)에 대한 UTC 시각(정수 timestamp) 모음.
+
+    구간은 서머타임을 반영해 미리 계산되므로, 판정은 정수 비교만으로 끝납니다.
+    """
+
+    __slots__ = ("date", "next_date", "start", "end", "midnight", "registration", "completion")
+
+    def __init__(self, tz, day):
+        def at(d, hour):
+            # 없는 시각(서머타임 시작)은 normalize가 실제 존재하는 시각으로 옮겨 줌
+            return int(tz.normalize(tz.localize(datetime.combine(d, time(hour)))).timestamp())
+        next_day = day + timedelta(days=1)
+        self.date = day.strftime('%Y-%m-%d')
+        self.next_date = next_day.strftime('%Y-%m-%d')
+        self.start = at(day, RESET_HOUR)
+        self.end = at(next_day, RESET_HOUR)
+        self.midnight = at(next_day, 0)
+        self.registration = (at(day, REGISTRATION_HOURS[0]), at(day, REGISTRATION_HOURS[1]))
+        self.completion = (at(day, COMPLETION_HOURS[0]), self.end)
+
+    def contains(self, now):
+        return self.start <= now < self.end
+
+
+class LocalClock:
+    """플레이어 시간대 관련 계산을 한 곳에서 처리합니다.
+
+    시간대 객체와 시간대별 LocalDay를 캐시해 두고, 하루가 끝날 때(다음 오전 2시)만 다시 계산합니다.
+    저장된 시간대 값이 없거나 잘못되었으면 기본 시간대(KST)를 사용합니다.
+    """
+
+    def __init__(self, default=DEFAULT_TIMEZONE):
+        self.valid_zones = frozenset(pytz.all_timezones)
+        self.default = pytz.timezone(default)
+        self._zones = {}
+        self._days = {}
+
+    def is_valid(self, name):
+        return name in self.valid_zones
+
+    def zone(self, tz_value):
+        tz = self._zones.get(tz_value)
+        if tz is None:
+            tz = pytz.timezone(tz_value) if tz_value in self.valid_zones else self.default
+            self._zones[tz_value] = tz
+        return tz
+
+    def now(self, tz_value):
+        """현지 시각 (메시지 표시용)"""
+        return datetime.now(self.zone(tz_value))
+
+    def day(self, tz_value, now=None):
+        """현재 시각이 속한 LocalDay"""
+        now = int(_time.time()) if now is None else now
+        local_day = self._days.get(tz_value)
+        if local_day is None or not local_day.contains(now):
+            tz = self.zone(tz_value)
+            now_local = datetime.fromtimestamp(now, tz)
+            day = now_local.date() - timedelta(days=1) if now_local.hour < RESET_HOUR else now_local.date()
+            local_day = self._days[tz_value] = LocalDay(tz, day)
+        return local_day
+
+    def reset_day(self, tz_value):
+        """오전 2시를 하루의 시작으로 본 현지 날짜 (일일 초기화 기준)"""
+        return self.day(tz_value).date
+
+    def today(self, tz_value):
+        """현지 달력 날짜 (자정 기준)"""
+        now = int(_time.time())
+        local_day = self.day(tz_value, now)
+        return local_day.date if now < local_day.midnight else local_day.next_date
+
+    def registration_open(self, tz_value):
+        now = int(_time.time())
+        start, end = self.day(tz_value, now).registration
+        return start <= now < end
+
+    def completion_open(self, tz_value):
+        now = int(_time.time())
+        start, end = self.day(tz_value, now).completion
+        return start <= now < end
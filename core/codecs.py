@@ -0,0 +1,115 @@
+# core/codecs.py
+
+import json
+import struct
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# 바이너리 스냅샷은 앞부분의 매직 바이트로 형식을 구분 (JSON은 '{'로 시작하므로 겹치지 않음)
+MAGIC_MSGPACK = b"PSNP\x01M"
+MAGIC_FRAMED = b"PSNP\x01F"
+
+
+class JsonCodec:
+    """표준 라이브러리 json, 공백 없는 compact 형식 (기본값)"""
+    name = "json"
+    magic = None
+
+    def encode(self, data):
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    def decode(self, payload):
+        return json.loads(payload.decode('utf-8'))
+
+
+class PrettyJsonCodec(JsonCodec):
+    """사람이 읽기 위한 들여쓰기 JSON. 저장용이 아니라 !데이터내보내기 전용"""
+    name = "pretty"
+
+    def encode(self, data):
+        return json.dumps(data, indent=4, ensure_ascii=False).encode('utf-8')
+
+
+class OrjsonCodec(JsonCodec):
+    """orjson이 설치되어 있으면 사용하는 빠른 JSON (파일 형식은 JsonCodec과 동일)"""
+    name = "orjson"
+
+    def encode(self, data):
+        return orjson.dumps(data)
+
+    def decode(self, payload):
+        return orjson.loads(payload)
+
+
+class MsgpackCodec:
+    name = "msgpack"
+    magic = MAGIC_MSGPACK
+
+    def encode(self, data):
+        return self.magic + msgpack.packb(data, use_bin_type=True)
+
+    def decode(self, payload):
+        return msgpack.unpackb(payload[len(self.magic):], raw=False, strict_map_key=False)
+
+
+class FramedCodec:
+    """추가 패키지 없이 쓰는 길이 접두(length-prefixed) 바이너리 스냅샷.
+
+    [매직][플레이어 수] 다음에 플레이어마다 [ID 길이][ID][데이터 길이][compact JSON] 이 이어집니다.
+    """
+    name = "framed"
+    magic = MAGIC_FRAMED
+    _count = struct.Struct("<I")
+
+    def __init__(self):
+        self._json = OrjsonCodec() if orjson else JsonCodec()
+
+    def encode(self, data):
+        parts = [self.magic, self._count.pack(len(data))]
+        for key, value in data.items():
+            key_bytes, value_bytes = key.encode('utf-8'), self._json.encode(value)
+            parts += [self._count.pack(len(key_bytes)), key_bytes, self._count.pack(len(value_bytes)), value_bytes]
+        return b"".join(parts)
+
+    def decode(self, payload):
+        view = memoryview(payload)
+        offset = len(self.magic)
+        (count,), offset = self._count.unpack_from(view, offset), offset + 4
+        data = {}
+        for _ in range(count):
+            (key_len,) = self._count.unpack_from(view, offset); offset += 4
+            key = bytes(view[offset:offset + key_len]).decode('utf-8'); offset += key_len
+            (value_len,) = self._count.unpack_from(view, offset); offset += 4
+            data[key] = self._json.decode(bytes(view[offset:offset + value_len])); offset += value_len
+        return data
+
+
+CODECS = {codec.name: codec for codec in (JsonCodec, PrettyJsonCodec, OrjsonCodec, MsgpackCodec, FramedCodec)}
+
+
+def get_codec(name="auto"):
+    """이름으로 코덱을 고릅니다. auto는 orjson이 있으면 orjson, 없으면 표준 json"""
+    if name == "auto":
+        name = "orjson" if orjson else "json"
+    if name == "orjson" and orjson is None:
+        raise RuntimeError("orjson 코덱을 사용하려면 `pip install orjson` 이 필요합니다.")
+    if name == "msgpack" and msgpack is None:
+        raise RuntimeError("msgpack 코덱을 사용하려면 `pip install msgpack` 이 필요합니다.")
+    return CODECS[name]()
+
+
+def detect_codec(payload):
+    """저장된 파일 내용을 보고 어떤 형식인지 판별합니다. (설정한 코덱과 달라도 읽을 수 있도록)"""
+    if payload.startswith(MAGIC_MSGPACK):
+        return get_codec("msgpack")
+    if payload.startswith(MAGIC_FRAMED):
+        return get_codec("framed")
+    return get_codec("auto")
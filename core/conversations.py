@@ -0,0 +1,102 @@
+# core/conversations.py
+
+import asyncio
+
+MAX_PER_USER = 3  # 한 사람이 동시에 진행할 수 있는 대화 수 (채널마다 하나씩)
+
+
+class Conversation:
+    """한 채널에서 한 사람과 주고받는 대화. with 블록이 끝나면 등록이 풀립니다.
+
+    ask()는 그 사람이 그 채널에 보내는 다음 메시지(accept를 통과한 것)를 돌려줍니다.
+    제한 시간은 대화마다 하나인 공용 타이머를 reset()해서 재므로 질문이 여러 번이어도 작업이 늘지 않습니다.
+    """
+
+    __slots__ = ("registry", "key", "_future", "_accept", "_timer")
+
+    def __init__(self, registry, key):
+        self.registry = registry
+        self.key = key
+        self._future = None
+        self._accept = None
+        self._timer = None
+
+    async def ask(self, accept=None, *, timeout):
+        """다음 메시지를 기다립니다. accept(message)가 False인 메시지는 무시 (일반 메시지/명령어로 처리됨)"""
+        self._future = asyncio.get_running_loop().create_future()
+        self._accept = accept
+        if self._timer is None:
+            self._timer = self.registry.timers.schedule(timeout, self._expire)
+        else:
+            self._timer.reset(timeout)
+        try:
+            return await self._future
+        finally:
+            self._timer.cancel()
+            self._future = self._accept = None
+
+    def _expire(self):
+        if self._future is not None and not self._future.done():
+            self._future.set_exception(asyncio.TimeoutError())
+
+    def offer(self, message):
+        """기다리던 답이면 받아서 True를 반환합니다."""
+        if self._future is None or self._future.done():
+            return False
+        if self._accept is not None and not self._accept(message):
+            return False
+        self._future.set_result(message)
+        return True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if self._timer is not None: self._timer.cancel()
+        self.registry._close(self)
+
+
+class Conversations:
+    """진행 중인 대화 목록 ((채널 ID, 사용자 ID) → Conversation).
+
+    메시지가 오면 dispatch()가 키 하나로 기다리던 대화를 바로 찾아 넘깁니다.
+    (bot.wait_for처럼 기다리는 모든 check 함수를 메시지마다 돌리지 않음)
+    """
+
+    def __init__(self, timers, max_per_user=MAX_PER_USER):
+        self.timers = timers
+        self.max_per_user = max_per_user
+        self._active = {}
+        self._per_user = {}
+
+    def __len__(self):
+        return len(self._active)
+
+    def is_waiting(self, channel_id, author_id):
+        return (channel_id, author_id) in self._active
+
+    async def begin(self, ctx):
+        """ctx의 채널/사용자로 대화를 엽니다. 이미 진행 중이거나 한도를 넘으면 안내 후 None을 반환합니다."""
+        key = (ctx.channel.id, ctx.author.id)
+        if key in self._active:
+            await ctx.send("이 채널에서 이미 답변을 기다리는 중인 명령어가 있습니다. 먼저 답하거나 시간이 지나기를 기다려주세요.")
+            return None
+        if self._per_user.get(ctx.author.id, 0) >= self.max_per_user:
+            await ctx.send(f"동시에 진행할 수 있는 대화는 {self.max_per_user}개까지입니다. 진행 중인 대화를 먼저 마쳐주세요.")
+            return None
+        conversation = self._active[key] = Conversation(self, key)
+        self._per_user[ctx.author.id] = self._per_user.get(ctx.author.id, 0) + 1
+        return conversation
+
+    def _close(self, conversation):
+        if self._active.get(conversation.key) is not conversation:
+            return
+        del self._active[conversation.key]
+        author_id = conversation.key[1]
+        if self._per_user[author_id] <= 1: del self._per_user[author_id]
+        else: self._per_user[author_id] -= 1
+
+    def dispatch(self, message):
+        """대화의 답으로 쓰인 메시지면 True (이 경우 명령어로 처리하지 않음)"""
+        conversation = self._active.get((message.channel.id, message.author.id))
+        return conversation is not None and conversation.offer(message)
@@ -0,0 +1,118 @@
+# core/daily_reset.py
+
+import asyncio
+import heapq
+import itertools
+import time as _time
+
+# 시계가 크게 바뀌는 경우(절전 복귀 등)에도 일정을 다시 확인하도록 최대 대기 시간을 제한
+MAX_SLEEP = 3600
+
+
+class DailyResetScheduler:
+    """시간대별 오전 2시에 맞춰 그 시간대의 플레이어만 일일 초기화합니다.
+
+    시간대마다 다음 현지 오전 2시(UTC 시각)를 최소 힙에 넣어 두고, 가장 가까운 시각까지만 잠듭니다.
+    플레이어의 시간대가 바뀌면(store.timezone_listeners) 새 시간대를 일정에 추가하고
+    그 플레이어 한 명만 새 시간대 기준으로 따라잡기 초기화를 합니다.
+
+    lazy=True이면 백그라운드 작업 없이, 일일 정보를 쓰는 명령어가 get_player()로 조회할 때만
+    그 플레이어를 초기화합니다. (접속하지 않는 플레이어는 비용이 들지 않음)
+    """
+
+    def __init__(self, store, clock, lazy=False):
+        self.store = store
+        self.clock = clock
+        self.lazy = lazy
+        self._heap = []          # (다음 초기화 UTC timestamp, 순번, 시간대 값)
+        self._seq = itertools.count() # 같은 시각끼리 시간대 값(None 포함)을 비교하지 않도록
+        self._next_at = {}       # 시간대 값 → 힙에 들어 있는 최신 시각 (오래된 항목 구분용)
+        self._catch_up = set()   # 다음에 깨어났을 때 바로 확인할 시간대 값
+        self._wakeup = asyncio.Event()
+        self._task = None
+        if not lazy:
+            store.timezone_listeners.append(self.notify_timezone)
+
+    def get_player(self, player_id):
+        """일일 정보(도전/목표 횟수)를 쓰는 명령어용 조회.
+
+        마지막 초기화 날짜가 플레이어의 현지 날짜보다 이전이면 먼저 초기화합니다.
+        스케줄러 모드에서는 이미 초기화되어 있으므로 날짜 비교만 하고 넘어갑니다.
+        """
+        player_data = self.store.get(player_id)
+        if player_data is not None and player_data.registered:
+            self.store.reset_player_daily(player_id, self.clock.reset_day(player_data.timezone))
+        return player_data
+
+    def _schedule(self, tz_value):
+        at = self.clock.day(tz_value).end # 다음 현지 오전 2시 (서머타임 반영)
+        self._next_at[tz_value] = at
+        heapq.heappush(self._heap, (at, next(self._seq), tz_value))
+
+    def notify_timezone(self, player_id, tz_value):
+        """플레이어가 tz_value 시간대로 옮겨졌을 때 호출됩니다. (옮긴 플레이어만 확인)"""
+        if tz_value not in self._next_at:
+            self._schedule(tz_value)
+            self._wakeup.set() # 가장 가까운 초기화 시각이 바뀌었을 수 있음
+        self.store.reset_player_daily(player_id, self.clock.reset_day(tz_value))
+
+    def start(self):
+        if self.lazy: return
+        if self._task is None or self._task.done():
+            # 시작 시 모든 시간대를 일정에 넣고, 꺼져 있던 동안 놓친 초기화를 따라잡음
+            for tz_value in self.store.timezones():
+                if tz_value not in self._next_at: self._schedule(tz_value)
+                self._catch_up.add(tz_value)
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            # 초기화하는 동안 새 시간대가 추가되면 그 신호를 놓치지 않도록 먼저 비움
+            self._wakeup.clear()
+            try:
+                await self._reset_due()
+            except Exception as e:
+                print(f"❗️ 일일 초기화 중 오류 발생: {e}")
+            if self._catch_up: continue
+            timeout = MAX_SLEEP
+            if self._heap:
+                timeout = min(MAX_SLEEP, max(0.0, self._heap[0][0] - _time.time()))
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _reset_due(self):
+        now = _time.time()
+        due = self._catch_up
+        self._catch_up = set()
+        while self._heap and self._heap[0][0] <= now:
+            at, _, tz_value = heapq.heappop(self._heap)
+            if self._next_at.get(tz_value) != at:
+                continue # 다시 예약되면서 남은 오래된 항목
+            del self._next_at[tz_value]
+            due.add(tz_value)
+
+        active = self.store.timezones()
+        due_dates = {}
+        for tz_value in due:
+            if tz_value not in active:
+                self._next_at.pop(tz_value, None) # 아무도 쓰지 않는 시간대는 일정에서 제외
+                continue
+            if tz_value not in self._next_at:
+                self._schedule(tz_value)
+            due_dates[tz_value] = self.clock.reset_day(tz_value)
+        if not due_dates:
+            return
+        reset_ids = await self.store.reset_daily(due_dates)
+        if reset_ids:
+            print(f"[{self.clock.now(None).strftime('%H:%M')}] {len(reset_ids)}명의 일일 정보 초기화 완료.")
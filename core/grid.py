@@ -0,0 +1,69 @@
+# core/grid.py
+"""전투 맵의 칸 관계를 미리 계산해 둔 표.
+
+칸 번호는 왼쪽 위부터 0, 1, 2, ... (행 우선) 입니다. 거리, 이동, 사거리 판정은 모두 표를 한 번
+찾아보는 것으로 끝나므로 맵이 커져도 행동 한 번의 비용은 같습니다. 칸 집합(점유 칸, 사거리 안의 칸)은
+정수 비트마스크(칸 i → 1 << i)로 다룹니다.
+"""
+
+DEFAULT_SIZE = (3, 5)   # (행, 열)
+MIN_SIDE, MAX_SIDE = 3, 10
+# 방향키 → (행 변화, 열 변화)
+DIRECTIONS = {'w': (-1, 0), 's': (1, 0), 'a': (0, -1), 'd': (0, 1)}
+_GRIDS = {}
+
+
+class Grid:
+    __slots__ = ("rows", "cols", "size", "all_mask", "distance", "steps", "_range_masks")
+
+    def __init__(self, rows, cols):
+        self.rows, self.cols = rows, cols
+        self.size = rows * cols
+        self.all_mask = (1 << self.size) - 1
+        coords = [divmod(i, cols) for i in range(self.size)]
+        # distance[a][b]: 맨해튼 거리
+        self.distance = tuple(tuple(abs(r1 - r2) + abs(c1 - c2) for r2, c2 in coords) for r1, c1 in coords)
+        # steps[칸][방향키]: 한 칸 이동한 위치 (맵 밖이면 None)
+        self.steps = tuple(
+            {key: (r + dr) * cols + (c + dc) if 0 <= r + dr < rows and 0 <= c + dc < cols else None
+             for key, (dr, dc) in DIRECTIONS.items()}
+            for r, c in coords)
+        self._range_masks = {}
+
+    @classmethod
+    def get(cls, rows=DEFAULT_SIZE[0], cols=DEFAULT_SIZE[1]):
+        """같은 크기의 맵은 표를 공유합니다."""
+        grid = _GRIDS.get((rows, cols))
+        if grid is None:
+            grid = _GRIDS[rows, cols] = cls(rows, cols)
+        return grid
+
+    def range_mask(self, pos, low, high):
+        """pos에서 거리가 low~high인 칸들의 비트마스크 (사거리별로 처음 쓸 때 한 번만 계산)"""
+        masks = self._range_masks.get((low, high))
+        if masks is None:
+            masks = self._range_masks[low, high] = tuple(
+                sum(1 << b for b, d in enumerate(row) if low <= d <= high) for row in self.distance)
+        return masks[pos]
+
+    def cells(self, mask):
+        """비트마스크에 들어 있는 칸 번호들"""
+        while mask:
+            low_bit = mask & -mask
+            yield low_bit.bit_length() - 1
+            mask ^= low_bit
+
+    def corners(self):
+        """왼쪽 위, 왼쪽 아래, 오른쪽 위, 오른쪽 아래"""
+        return 0, (self.rows - 1) * self.cols, self.cols - 1, self.size - 1
+
+
+def parse_size(text):
+    """'5x3'(가로x세로) 형식을 (행, 열)로 바꿉니다. 잘못된 값이면 ValueError(사용자에게 보여줄 문구)"""
+    try:
+        cols, rows = (int(part) for part in text.lower().replace('×', 'x').split('x'))
+    except ValueError:
+        raise ValueError("맵 크기는 `가로x세로` 형식으로 입력해주세요. (예: `5x3`)") from None
+    if not (MIN_SIDE <= rows <= MAX_SIDE and MIN_SIDE <= cols <= MAX_SIDE):
+        raise ValueError(f"맵의 가로와 세로는 {MIN_SIDE}~{MAX_SIDE} 사이여야 합니다.")
+    return rows, cols
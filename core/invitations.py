@@ -0,0 +1,97 @@
+# core/invitations.py
+
+import asyncio
+from collections import deque
+
+
+class Invitation:
+    """반응(✅/❌)으로 수락을 받는 초대 메시지 하나. with 블록이 끝나면 등록이 풀립니다.
+
+    초대받은 사람이 허용된 이모지로 반응하면 응답이 쌓이고, next_response()가 차례대로 돌려줍니다.
+    """
+
+    __slots__ = ("registry", "message_id", "invitees", "emojis", "_responses", "_wake", "_timer")
+
+    def __init__(self, registry, message_id, invitees, emojis):
+        self.registry = registry
+        self.message_id = message_id
+        self.invitees = {member.id: member for member in invitees}
+        self.emojis = emojis
+        self._responses = deque()
+        self._wake = None
+        self._timer = None
+
+    def offer(self, user_id, emoji):
+        member = self.invitees.get(user_id)
+        if member is None or emoji not in self.emojis:
+            return False
+        self._responses.append((member, emoji))
+        if self._wake is not None and not self._wake.done():
+            self._wake.set_result(None)
+        return True
+
+    async def next_response(self, *, timeout):
+        """(반응한 멤버, 이모지)를 반환합니다. timeout초 안에 응답이 없으면 asyncio.TimeoutError"""
+        if self._timer is None:
+            self._timer = self.registry.timers.schedule(timeout, self._expire)
+        else:
+            self._timer.reset(timeout)
+        try:
+            while not self._responses:
+                self._wake = asyncio.get_running_loop().create_future()
+                await self._wake
+            return self._responses.popleft()
+        finally:
+            self._timer.cancel()
+            self._wake = None
+
+    def _expire(self):
+        if self._wake is not None and not self._wake.done():
+            self._wake.set_exception(asyncio.TimeoutError())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if self._timer is not None: self._timer.cancel()
+        if self.registry._pending.get(self.message_id) is self:
+            del self.registry._pending[self.message_id]
+
+
+class Invitations:
+    """대기 중인 대결 초대 (메시지 ID → Invitation)와 초대 중인 채널 목록.
+
+    반응이 오면 dispatch()가 메시지 ID 하나로 해당 초대를 바로 찾습니다. (반응마다 모든 check를 돌리지 않음)
+    reserve()는 같은 채널에서 초대가 동시에 진행되어 전투가 둘 시작되지 않도록 채널을 잡아 둡니다.
+    """
+
+    def __init__(self, timers):
+        self.timers = timers
+        self._pending = {}
+        self._reserved = set()
+
+    def __len__(self):
+        return len(self._pending)
+
+    def reserve(self, channel_id):
+        """채널을 초대 중으로 표시합니다. 이미 초대 중이면 False"""
+        if channel_id in self._reserved:
+            return False
+        self._reserved.add(channel_id)
+        return True
+
+    def release(self, channel_id):
+        self._reserved.discard(channel_id)
+
+    def is_reserved(self, channel_id):
+        return channel_id in self._reserved
+
+    def open(self, message, invitees, emojis=("✅",)):
+        """message에 대한 반응을 받기 시작합니다. 반응을 달기 전에 열어야 빠른 응답을 놓치지 않습니다."""
+        invitation = self._pending[message.id] = Invitation(self, message.id, invitees, emojis)
+        return invitation
+
+    def dispatch(self, payload):
+        """on_raw_reaction_add의 payload를 해당 초대로 넘깁니다. 초대의 응답이면 True"""
+        invitation = self._pending.get(payload.message_id)
+        return invitation is not None and invitation.offer(payload.user_id, str(payload.emoji))
@@ -0,0 +1,69 @@
+# core/journal.py
+
+import asyncio
+import json
+import os
+
+JOURNAL_FILE = "player_data.journal"
+
+
+class Journal:
+    """플레이어 데이터 변경 기록을 한 줄에 하나씩(JSON Lines) 덧붙이는 파일.
+
+    기록 예시:
+        {"at": "...", "op": "incr", "id": "123", "key": "school_points", "value": 20, "result": 140, "by": "..."}
+        {"at": "...", "op": "append", "id": "123", "key": "inventory", "value": "알사탕", "result": ["알사탕"]}
+        {"at": "...", "op": "put", "id": "123", "value": {...플레이어 전체...}}
+        {"at": "...", "op": "note", "by": "...", "text": "..."}
+
+    복원할 때는 result(변경 후 값)를 그대로 덮어쓰므로, 같은 기록을 두 번 적용해도 결과가 같습니다.
+    덕분에 스냅샷을 쓴 직후 저널을 비우기 전에 종료되어도 안전합니다.
+    """
+
+    def __init__(self, path=JOURNAL_FILE):
+        self.path = path
+        self.size = os.path.getsize(path) if os.path.exists(path) else 0
+
+    def read(self):
+        if not os.path.exists(self.path):
+            return []
+        entries = []
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # 기록 도중 종료되어 잘린 마지막 줄은 버림
+                    break
+        return entries
+
+    async def append(self, entries):
+        if not entries:
+            return
+        text = "".join(json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + "\n" for entry in entries)
+        await asyncio.to_thread(self._append, text.encode('utf-8'))
+
+    def _append(self, payload):
+        with open(self.path, 'ab') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        self.size += len(payload)
+
+    async def truncate(self):
+        await asyncio.to_thread(self._truncate)
+
+    def _truncate(self):
+        with open(self.path, 'wb') as f:
+            os.fsync(f.fileno())
+        self.size = 0
+
+
+def apply_entry(data, entry):
+    """저널 기록 하나를 플레이어 데이터(dict)에 적용합니다."""
+    op = entry.get("op")
+    if op == "put":
+        data[entry["id"]] = entry["value"]
+    elif op in ("incr", "set", "append", "remove"):
+        data.setdefault(entry["id"], {})[entry["key"]] = entry["result"]
+    # note 등 나머지 기록은 감사(audit)용이므로 적용할 내용이 없음
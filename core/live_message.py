@@ -0,0 +1,69 @@
+# core/live_message.py
+
+import asyncio
+
+import discord
+
+from core.outbox import BACKGROUND
+
+
+class LiveMessage:
+    """채널에 메시지 하나를 띄워 두고, 상태가 바뀔 때마다 새로 보내지 않고 제자리에서 수정합니다.
+
+    request()는 바로 보내지 않고 delay초 뒤에 한 번만 render()를 호출하므로,
+    그 사이의 여러 변경은 수정 한 번으로 합쳐집니다. 마지막으로 보낸 내용과 같으면 수정하지 않고,
+    메시지가 삭제되었으면 새로 보냅니다. outbox를 주면 전송/수정을 낮은 우선순위로 그 대기열에 넣습니다.
+    """
+
+    def __init__(self, channel, render, delay=0.5, outbox=None):
+        self.channel = channel
+        self.render = render  # 현재 상태로 discord.Embed를 만드는 함수
+        self.delay = delay
+        self.outbox = outbox
+        self.message = None
+        self._last_sent = None
+        self._requested = False
+        self._task = None
+        self._lock = asyncio.Lock()
+
+    def request(self):
+        """다음 렌더링을 예약합니다. (이미 예약되어 있으면 합쳐짐)"""
+        self._requested = True
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._render_later())
+
+    async def _render_later(self):
+        # 수정하는 동안 들어온 request()는 이 작업이 이어서 처리 (새 작업이 만들어지지 않으므로)
+        while self._requested:
+            await asyncio.sleep(self.delay)
+            try:
+                await self.flush()
+            except discord.HTTPException as e:
+                print(f"❗️ 메시지 갱신 중 오류 발생: {e}")
+
+    async def flush(self):
+        """예약된 렌더링이 있으면 지금 바로 반영합니다. (전투 종료 직전 등)"""
+        async with self._lock:
+            if not self._requested:
+                return
+            self._requested = False
+            embed = self.render()
+            data = embed.to_dict()
+            if data == self._last_sent:
+                return
+            if self.message is not None:
+                try:
+                    if self.outbox: await self.outbox.edit(self.message, embed=embed, priority=BACKGROUND)
+                    else: await self.message.edit(embed=embed)
+                except discord.NotFound:
+                    self.message = None # 누군가 메시지를 지웠으면 아래에서 다시 보냄
+            if self.message is None:
+                if self.outbox: self.message = await self.outbox.send(self.channel, embed=embed, priority=BACKGROUND, merge=False)
+                else: self.message = await self.channel.send(embed=embed)
+            self._last_sent = data
+
+    async def close(self):
+        """남은 변경을 반영하고 예약을 정리합니다."""
+        await self.flush()
+        if self._task and not self._task.done() and self._task is not asyncio.current_task():
+            self._task.cancel()
@@ -0,0 +1,30 @@
+# core/lookup.py
+
+async def find_player_by_name(ctx, store, target_name):
+    """[관리자용 명령어] 등록된 이름(또는 디스코드 ID)으로 플레이어를 찾습니다.
+
+    찾지 못했거나 동명이인이 있으면 안내 메시지를 보내고 (None, None)을 반환합니다.
+    """
+    name = target_name.strip('"')
+    if name.isdigit() and name in store:
+        return name, store.get(name)
+
+    player_ids = store.find_by_name(name)
+    if len(player_ids) == 1:
+        return player_ids[0], store.get(player_ids[0])
+
+    if not player_ids:
+        message = f"'{name}' 이름을 가진 플레이어를 찾을 수 없습니다."
+        suggestions = store.search_names(name)
+        if suggestions:
+            message += "\n> 혹시 이 이름인가요? " + ", ".join(f"`{n}`" for n in suggestions)
+    else:
+        message = f"'{name}' 이름을 가진 플레이어가 {len(player_ids)}명 있습니다. 이름 대신 아래 ID 중 하나를 입력해주세요.\n"
+        message += "\n".join(f"> `{pid}`" for pid in player_ids)
+    await ctx.send(message)
+    return None, None
+
+
+def audit_actor(ctx):
+    """저널에 남길 관리자 명령어 실행 정보 (누가, 어떤 명령어로)"""
+    return f"{ctx.author}({ctx.author.id}) {ctx.message.content}"
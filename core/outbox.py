@@ -0,0 +1,207 @@
+# core/outbox.py
+
+import asyncio
+import heapq
+import itertools
+from collections import Counter
+
+import discord
+from discord.ext import commands
+
+# 우선순위 (작을수록 먼저 전송)
+INTERACTIVE = 0  # 명령어에 대한 응답 (ctx.send)
+NORMAL = 1       # 전투 결과 발표 등
+BACKGROUND = 2   # 전투 현황판 갱신처럼 조금 늦어도 되는 것
+
+# 디스코드 전송 한도: 채널마다 5초에 5개, 봇 전체 초당 50개
+CHANNEL_BURST, CHANNEL_PERIOD = 5, 5.0
+GLOBAL_BURST, GLOBAL_PERIOD = 50, 1.0
+MAX_CONTENT = 2000
+MAX_EMBEDS = 10
+_MERGEABLE_KEYS = {"embed", "embeds"}
+
+
+class TokenBucket:
+    """burst개까지 모아 둘 수 있고 period초에 burst개씩 다시 채워지는 전송 가능 횟수"""
+
+    __slots__ = ("burst", "rate", "tokens", "updated")
+
+    def __init__(self, burst, period):
+        self.burst = burst
+        self.rate = burst / period
+        self.tokens = float(burst)
+        self.updated = None
+
+    def _refill(self, now):
+        if self.updated is not None:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, now):
+        """토큰 하나가 생길 때까지 기다려야 하는 시간 (지금 있으면 0)"""
+        self._refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self, now):
+        self._refill(now)
+        self.tokens -= 1
+
+
+class _Outgoing:
+    __slots__ = ("kind", "target", "content", "kwargs", "merge", "future", "queued_at")
+
+    def __init__(self, kind, target, content, kwargs, queued_at, merge=False):
+        self.kind = kind          # "send" 또는 "edit"
+        self.target = target      # send: 채널, edit: 메시지
+        self.content = content
+        self.kwargs = kwargs
+        self.merge = merge        # 다른 메시지와 합쳐도 되는지
+        self.future = asyncio.get_running_loop().create_future()
+        self.queued_at = queued_at
+
+    @property
+    def mergeable(self):
+        return self.merge and set(self.kwargs) <= _MERGEABLE_KEYS
+
+    def embeds(self):
+        if "embeds" in self.kwargs: return list(self.kwargs["embeds"] or [])
+        return [self.kwargs["embed"]] if self.kwargs.get("embed") else []
+
+
+class _ChannelQueue:
+    __slots__ = ("heap", "bucket", "task", "edits")
+
+    def __init__(self):
+        self.heap = []          # (우선순위, 순번, _Outgoing)
+        self.bucket = TokenBucket(CHANNEL_BURST, CHANNEL_PERIOD)
+        self.task = None
+        self.edits = {}         # 메시지 ID → 대기 중인 수정 (같은 메시지 수정은 마지막 것만 보냄)
+
+
+class Outbox:
+    """봇이 보내는 모든 메시지를 채널별 대기열에 모았다가 전송 한도에 맞춰 내보냅니다.
+
+    - 채널마다 토큰 버킷으로 속도를 맞추므로 몰릴 때도 429 없이 순서대로 나갑니다.
+    - 대기 중인 일반 메시지(내용/임베드만 있는 것)는 우선순위가 같으면 한 메시지로 합칩니다.
+    - 같은 메시지에 대한 수정이 밀려 있으면 마지막 수정만 보냅니다.
+    - 명령어 응답(INTERACTIVE)이 현황판 갱신(BACKGROUND)보다 먼저 나갑니다.
+    """
+
+    def __init__(self):
+        self._queues = {}
+        self._seq = itertools.count()
+        self._global = TokenBucket(GLOBAL_BURST, GLOBAL_PERIOD)
+        self.counters = Counter()  # sent, merged, edits, edits_coalesced, rate_limited, failed
+
+    async def send(self, channel, content=None, *, priority=INTERACTIVE, merge=True, **kwargs):
+        """channel.send()와 같은 인자를 받고, 실제로 보낸 메시지를 반환합니다. (합쳐졌으면 합친 메시지)
+
+        반환된 메시지에 반응을 달거나 나중에 수정하는 경우처럼 메시지를 혼자 차지해야 하면 merge=False
+        """
+        item = _Outgoing("send", channel, content, kwargs, self._now(), merge)
+        self._enqueue(channel.id, priority, item)
+        return await item.future
+
+    async def edit(self, message, *, priority=BACKGROUND, **kwargs):
+        queue = self._queue(message.channel.id)
+        pending = queue.edits.get(message.id)
+        if pending is not None and not pending.future.done():
+            pending.kwargs.update(kwargs) # 아직 안 보낸 수정에 덮어쓰기
+            self.counters["edits_coalesced"] += 1
+            return await pending.future
+        item = _Outgoing("edit", message, None, kwargs, self._now())
+        queue.edits[message.id] = item
+        self._enqueue(message.channel.id, priority, item)
+        return await item.future
+
+    @staticmethod
+    def _now():
+        return asyncio.get_running_loop().time()
+
+    def _queue(self, channel_id):
+        queue = self._queues.get(channel_id)
+        if queue is None:
+            queue = self._queues[channel_id] = _ChannelQueue()
+        return queue
+
+    def _enqueue(self, channel_id, priority, item):
+        queue = self._queue(channel_id)
+        heapq.heappush(queue.heap, (priority, next(self._seq), item))
+        if queue.task is None or queue.task.done():
+            queue.task = asyncio.create_task(self._drain(queue))
+
+    async def _drain(self, queue):
+        while queue.heap:
+            now = self._now()
+            wait = max(queue.bucket.delay(now), self._global.delay(now))
+            if wait > 0:
+                await asyncio.sleep(wait)
+                continue
+            batch = self._next_batch(queue)
+            queue.bucket.take(now); self._global.take(now)
+            await self._deliver(queue, batch)
+
+    def _next_batch(self, queue):
+        """가장 급한 항목 하나와, 그 뒤에 이어지는 같은 우선순위의 합칠 수 있는 메시지들"""
+        priority, _, first = heapq.heappop(queue.heap)
+        batch = [first]
+        if not first.mergeable:
+            return batch
+        length, embeds = len(first.content or ""), len(first.embeds())
+        taken = []
+        for entry in sorted(queue.heap):
+            item = entry[2]
+            if entry[0] != priority or not item.mergeable or item.target.id != first.target.id: break
+            add_length = len(item.content or "") + (1 if item.content and length else 0)
+            if length + add_length > MAX_CONTENT or embeds + len(item.embeds()) > MAX_EMBEDS: break
+            length += add_length; embeds += len(item.embeds())
+            batch.append(item); taken.append(entry)
+        if taken:
+            queue.heap = [entry for entry in queue.heap if entry not in taken]
+            heapq.heapify(queue.heap)
+        return batch
+
+    async def _deliver(self, queue, batch):
+        first = batch[0]
+        try:
+            if first.kind == "edit":
+                queue.edits.pop(first.target.id, None)
+                result = await first.target.edit(**first.kwargs)
+                self.counters["edits"] += 1
+            elif len(batch) == 1:
+                result = await first.target.send(first.content, **first.kwargs)
+                self.counters["sent"] += 1
+            else:
+                content = "\n".join(item.content for item in batch if item.content) or None
+                embeds = [embed for item in batch for embed in item.embeds()]
+                result = await first.target.send(content, embeds=embeds) if embeds else await first.target.send(content)
+                self.counters["sent"] += 1; self.counters["merged"] += len(batch) - 1
+        except Exception as e:
+            if isinstance(e, discord.HTTPException) and e.status == 429: self.counters["rate_limited"] += 1
+            self.counters["failed"] += 1
+            for item in batch:
+                if not item.future.done(): item.future.set_exception(e)
+            return
+        for item in batch:
+            if not item.future.done(): item.future.set_result(result)
+
+    def metrics(self):
+        """대기열 현황 (!발송현황)"""
+        now = self._now()
+        depths = {cid: len(q.heap) for cid, q in self._queues.items() if q.heap}
+        by_priority = Counter(entry[0] for q in self._queues.values() for entry in q.heap)
+        oldest = min((entry[2].queued_at for q in self._queues.values() for entry in q.heap), default=now)
+        return {"channels": len(depths), "queued": sum(depths.values()), "max_depth": max(depths.values(), default=0),
+                "by_priority": dict(by_priority), "oldest_wait": now - oldest, **self.counters}
+
+    async def close(self):
+        for queue in self._queues.values():
+            if queue.task and not queue.task.done():
+                queue.task.cancel()
+
+
+class OutboxContext(commands.Context):
+    """ctx.send()를 bot.outbox로 보내는 명령어 컨텍스트 (main.py의 Bot.get_context에서 사용)"""
+
+    async def send(self, content=None, **kwargs):
+        return await self.bot.outbox.send(self.channel, content, **kwargs)
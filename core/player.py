@@ -0,0 +1,156 @@
+# core/player.py
+
+import copy
+from collections.abc import MutableMapping
+
+from core.schema import PLAYER_TEMPLATE
+
+DEFAULT_COLOR = 0xFFFFFF
+
+# JSON 키 → 속성 이름 ('class'는 파이썬 예약어라 player_class로 씁니다)
+_ATTRS = {key: ("player_class" if key == "class" else key) for key in PLAYER_TEMPLATE}
+_ATTRS["schema_version"] = "schema_version"
+_DEFAULTS = {**PLAYER_TEMPLATE, "schema_version": 0}
+
+
+def parse_color(value, default=DEFAULT_COLOR):
+    """'#RRGGBB' 문자열을 discord 색상 값(int)으로 바꿉니다. 형식이 잘못되면 default"""
+    try:
+        return int(value[1:], 16)
+    except (TypeError, ValueError):
+        return default
+
+
+class PlayerRecord(MutableMapping):
+    """플레이어 한 명의 데이터.
+
+    필드는 속성으로 읽고 씁니다. (player.mental, player.level, player.color_value ...)
+    색상은 저장될 때 한 번만 해석하고, 레벨은 스탯이 바뀔 때까지 캐시합니다.
+    저널/SQLite/마이그레이션 코드와의 호환을 위해 dict처럼 record["key"]로도 접근할 수 있고,
+    알 수 없는 키는 extra에 담겨 to_dict()에서 원래 JSON 모양 그대로 돌아갑니다.
+    """
+
+    __slots__ = (
+        "_mental", "_physical", "_level", "_color", "_color_value",
+        "registered", "player_class", "advanced_class", "attribute",
+        "name", "emoji",
+        "challenge_type", "challenge_registered_today", "rest_buff_active",
+        "school_points", "inventory", "goals", "daily_goal_info",
+        "today_blessing", "last_blessing_date",
+        "timezone", "last_daily_reset_date", "schema_version",
+        "extra", "_missing",
+    )
+
+    def __init__(self):
+        for key, attr in _ATTRS.items():
+            setattr(self, attr, copy.copy(_DEFAULTS[key]))
+        self.extra = None
+        # 원본 JSON에 없던 키 (마이그레이션 전 데이터를 그대로 다시 쓰기 위함)
+        self._missing = None
+
+    @classmethod
+    def from_dict(cls, data):
+        record = cls()
+        for key, value in data.items():
+            record[key] = value
+        missing = {key for key in _ATTRS if key not in data}
+        record._missing = missing or None
+        return record
+
+    def to_dict(self):
+        """저장용 dict. 리스트/딕셔너리는 복사하므로 스레드에서 직렬화해도 안전합니다."""
+        data = {}
+        for key, attr in _ATTRS.items():
+            if self._missing and key in self._missing: continue
+            value = getattr(self, attr)
+            if isinstance(value, list): value = list(value)
+            elif isinstance(value, dict): value = dict(value)
+            data[key] = value
+        if self.extra:
+            data.update(copy.deepcopy(self.extra))
+        return data
+
+    # --- 파생 값 ---
+    @property
+    def mental(self):
+        return self._mental
+
+    @mental.setter
+    def mental(self, value):
+        self._mental = value; self._level = None
+
+    @property
+    def physical(self):
+        return self._physical
+
+    @physical.setter
+    def physical(self, value):
+        self._physical = value; self._level = None
+
+    @property
+    def total_stats(self):
+        return (self._mental or 0) + (self._physical or 0)
+
+    @property
+    def level(self):
+        if self._level is None:
+            self._level = 1 + self.total_stats // 5
+        return self._level
+
+    @property
+    def color(self):
+        return self._color
+
+    @color.setter
+    def color(self, value):
+        self._color = value; self._color_value = parse_color(value)
+
+    @property
+    def color_value(self):
+        """embed에 바로 넣을 수 있는 색상 값"""
+        return self._color_value
+
+    # --- dict 호환 ---
+    def __getitem__(self, key):
+        attr = _ATTRS.get(key)
+        if attr is None:
+            if self.extra is None: raise KeyError(key)
+            return self.extra[key]
+        if self._missing and key in self._missing:
+            raise KeyError(key)
+        return getattr(self, attr)
+
+    def __setitem__(self, key, value):
+        attr = _ATTRS.get(key)
+        if attr is None:
+            if self.extra is None: self.extra = {}
+            self.extra[key] = value
+            return
+        setattr(self, attr, value)
+        if self._missing:
+            self._missing.discard(key)
+
+    def __delitem__(self, key):
+        attr = _ATTRS.get(key)
+        if attr is None:
+            if self.extra is None: raise KeyError(key)
+            del self.extra[key]
+            return
+        if self._missing and key in self._missing:
+            raise KeyError(key)
+        setattr(self, attr, copy.copy(_DEFAULTS[key]))
+        if self._missing is None: self._missing = set()
+        self._missing.add(key)
+
+    def __iter__(self):
+        for key in _ATTRS:
+            if not (self._missing and key in self._missing):
+                yield key
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self):
+        return len(_ATTRS) - len(self._missing or ()) + len(self.extra or ())
+
+    def __repr__(self):
+        return f"PlayerRecord({self.to_dict()!r})"
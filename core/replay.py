@@ -0,0 +1,91 @@
+# core/replay.py
+"""전투 재현용 기록. (디스코드와 무관)
+
+전투마다 시드를 정해 random.Random(seed)만 쓰고, 성공한 행동을 짧은 리스트로 차례대로 적어 둡니다.
+시작 능력치 + 시드 + 행동 기록만 있으면 replay()로 같은 전투를 그대로 다시 계산할 수 있습니다.
+
+행동 기록 형식: ["m", 행동자, "wd"] 이동, ["a", 행동자, 대상 또는 null] 공격, ["s", 행동자, 위치 또는 null] 특수,
+["k", 행동자] 스킬, ["f", 행동자] 기권, ["t", 행동자] 시간 초과
+"""
+
+import random
+import secrets
+from dataclasses import asdict
+
+from core.battle_engine import (Attack, Fighter, Forfeit, Move, Skill, Special, Timeout,
+                                apply, new_battle, next_turn)
+from core.grid import Grid
+
+REPLAY_LOG_FILE = "battle_log.jsonl"  # 끝난 전투 기록 (한 줄에 전투 하나)
+
+
+def encode_action(action):
+    if isinstance(action, Move): return ["m", action.actor, "".join(action.directions).lower()]
+    if isinstance(action, Attack): return ["a", action.actor, action.target]
+    if isinstance(action, Special): return ["s", action.actor, action.target_pos]
+    if isinstance(action, Skill): return ["k", action.actor]
+    if isinstance(action, Forfeit): return ["f", action.actor]
+    if isinstance(action, Timeout): return ["t", action.actor]
+    raise TypeError(f"알 수 없는 행동: {action!r}")
+
+
+def decode_action(item):
+    code, actor, *args = item
+    if code == "m": return Move(actor, tuple(args[0]))
+    if code == "a": return Attack(actor, args[0])
+    if code == "s": return Special(actor, args[0])
+    if code == "k": return Skill(actor)
+    if code == "f": return Forfeit(actor)
+    if code == "t": return Timeout(actor)
+    raise ValueError(f"알 수 없는 행동 기록: {item!r}")
+
+
+class ReplayLog:
+    """한 전투의 시드, 시작 능력치, 행동 기록. 새 전투는 start()로 시작합니다."""
+
+    __slots__ = ("seed", "teams", "map", "actions")
+
+    def __init__(self, seed, teams, map_size, actions=None):
+        self.seed = seed
+        self.teams = teams          # {"A": [Fighter dict, ...], "B": [...]} (new_battle 이전 상태)
+        self.map = map_size         # [행, 열]
+        self.actions = actions if actions is not None else []
+
+    @classmethod
+    def start(cls, team_a, team_b, grid=None, seed=None):
+        """시드를 정하고 전투를 시작합니다. (state, rng, 시작 이벤트, ReplayLog) 반환"""
+        grid = grid or Grid.get()
+        seed = secrets.randbits(64) if seed is None else seed
+        log = cls(seed, {"A": [asdict(f) for f in team_a], "B": [asdict(f) for f in team_b]}, [grid.rows, grid.cols])
+        rng = random.Random(seed)
+        state, events = new_battle(team_a, team_b, rng, grid)
+        return state, rng, events, log
+
+    def record(self, action):
+        """성공한 행동만 기록합니다. (규칙 위반으로 거절된 행동은 상태를 바꾸지 않으므로 제외)"""
+        self.actions.append(encode_action(action))
+
+    def to_dict(self):
+        return {"seed": self.seed, "teams": {team: [dict(f) for f in fs] for team, fs in self.teams.items()},
+                "map": list(self.map), "actions": [list(a) for a in self.actions]}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["seed"], data["teams"], data["map"], [list(a) for a in data["actions"]])
+
+
+def replay(log, on_events=None):
+    """기록을 처음부터 다시 계산해 (state, rng)를 반환합니다. on_events(action, events)로 과정을 받아볼 수 있음"""
+    rng = random.Random(log.seed)
+    team_a = [Fighter(**f) for f in log.teams["A"]]
+    team_b = [Fighter(**f) for f in log.teams["B"]]
+    state, events = new_battle(team_a, team_b, rng, Grid.get(*log.map))
+    if on_events: on_events(None, events)
+    for item in log.actions:
+        action = decode_action(item)
+        events = apply(state, action, rng)
+        if on_events: on_events(action, events)
+        if state.winner is None and any(event.kind == "turn_over" for event in events):
+            events = next_turn(state)
+            if on_events: on_events(None, events)
+    return state, rng
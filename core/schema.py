@@ -0,0 +1,76 @@
+# core/schema.py
+
+import copy
+from datetime import datetime, timedelta, timezone
+
+KST = timezone(timedelta(hours=9))
+
+# 플레이어 데이터의 최신 구조. !등록과 !리셋 모두 이 구조로 새 데이터를 만듭니다.
+PLAYER_TEMPLATE = {
+    "mental": 0, "physical": 0,
+    "registered": False, "class": None, "advanced_class": None, "attribute": None,
+    "name": None, "emoji": None, "color": None,
+    "challenge_type": None, "challenge_registered_today": False,
+    "rest_buff_active": False,
+    "school_points": 0, "inventory": [],
+    "goals": [], "daily_goal_info": {},
+    "today_blessing": None, "last_blessing_date": None,
+    "timezone": None, "last_daily_reset_date": None,
+}
+
+# 버전 번호 → 바로 이전 버전의 데이터를 그 버전으로 올리는 함수
+MIGRATIONS = {}
+
+
+def migration(version):
+    def register(func):
+        MIGRATIONS[version] = func
+        return func
+    return register
+
+
+@migration(1)
+def _add_timezone_and_goal_info(record):
+    """예전 !데이터점검이 하던 작업: 시간대/속성/초기화 날짜 추가, last_goal_date → daily_goal_info"""
+    record.setdefault("timezone", None)
+    if "last_goal_date" in record:
+        last_date = record.pop("last_goal_date")
+        if "daily_goal_info" not in record:
+            today_kst_str = datetime.now(KST).strftime('%Y-%m-%d')
+            record["daily_goal_info"] = {"date": last_date, "count": 1 if last_date == today_kst_str else 0}
+    record.setdefault("last_daily_reset_date", "2000-01-01")
+    record.setdefault("attribute", None)
+
+
+@migration(2)
+def _fill_missing_keys(record):
+    """!등록과 !리셋이 서로 다른 키를 쓰던 데이터를 같은 구조로 맞춤 (예: !리셋 후 사라진 inventory)"""
+    for key, default in PLAYER_TEMPLATE.items():
+        if key not in record:
+            record[key] = copy.deepcopy(default)
+
+
+SCHEMA_VERSION = max(MIGRATIONS)
+
+
+def new_player_record(fields=None):
+    """최신 버전의 새 플레이어 데이터를 만듭니다."""
+    record = copy.deepcopy(PLAYER_TEMPLATE)
+    record.update(fields or {})
+    record["schema_version"] = SCHEMA_VERSION
+    return record
+
+
+def is_outdated(record):
+    return record.get("schema_version", 0) < SCHEMA_VERSION
+
+
+def upgrade(record):
+    """필요한 마이그레이션을 차례대로 적용합니다. 바뀐 내용이 있으면 True"""
+    version = record.get("schema_version", 0)
+    if version >= SCHEMA_VERSION:
+        return False
+    for step in range(version + 1, SCHEMA_VERSION + 1):
+        MIGRATIONS[step](record)
+    record["schema_version"] = SCHEMA_VERSION
+    return True
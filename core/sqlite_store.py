@@ -0,0 +1,198 @@
+# core/sqlite_store.py
+
+import asyncio
+import json
+import sqlite3
+
+from core.player import PlayerRecord
+from core.storage import PlayerStore
+
+DB_FILE = "player_data.db"
+
+# (레코드 키, 컬럼 이름, bool 변환 여부) — 나머지 키는 extra 컬럼에 JSON으로 보관
+COLUMNS = [
+    ("registered", "registered", True),
+    ("name", "name", False),
+    ("class", "player_class", False),
+    ("advanced_class", "advanced_class", False),
+    ("attribute", "attribute", False),
+    ("emoji", "emoji", False),
+    ("color", "color", False),
+    ("mental", "mental", False),
+    ("physical", "physical", False),
+    ("school_points", "school_points", False),
+    ("timezone", "timezone", False),
+    ("challenge_type", "challenge_type", False),
+    ("challenge_registered_today", "challenge_registered_today", True),
+    ("rest_buff_active", "rest_buff_active", True),
+    ("today_blessing", "today_blessing", False),
+    ("last_blessing_date", "last_blessing_date", False),
+    ("last_daily_reset_date", "last_daily_reset_date", False),
+]
+CHILD_KEYS = ("inventory", "goals", "daily_goal_info")
+KNOWN_KEYS = {key for key, _, _ in COLUMNS} | set(CHILD_KEYS)
+MISSING_KEY = "__missing__"
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS players (
+    id TEXT PRIMARY KEY,
+    {", ".join(f"{column}" for _, column, _ in COLUMNS)},
+    goal_date TEXT,
+    goal_count INTEGER,
+    extra TEXT
+);
+CREATE TABLE IF NOT EXISTS inventory (
+    player_id TEXT NOT NULL REFERENCES players(id) ON DELETE CASCADE,
+    slot INTEGER NOT NULL,
+    item TEXT NOT NULL,
+    PRIMARY KEY (player_id, slot)
+);
+CREATE TABLE IF NOT EXISTS goals (
+    player_id TEXT NOT NULL REFERENCES players(id) ON DELETE CASCADE,
+    slot INTEGER NOT NULL,
+    goal TEXT NOT NULL,
+    PRIMARY KEY (player_id, slot)
+);
+CREATE INDEX IF NOT EXISTS idx_players_name ON players(name);
+CREATE INDEX IF NOT EXISTS idx_players_timezone ON players(timezone);
+"""
+
+_PLAYER_COLUMNS = ["id"] + [column for _, column, _ in COLUMNS] + ["goal_date", "goal_count", "extra"]
+UPSERT_PLAYER = (
+    f"INSERT INTO players ({', '.join(_PLAYER_COLUMNS)}) VALUES ({', '.join('?' * len(_PLAYER_COLUMNS))}) "
+    f"ON CONFLICT(id) DO UPDATE SET {', '.join(f'{c} = excluded.{c}' for c in _PLAYER_COLUMNS[1:])}"
+)
+
+
+def record_to_rows(player_id, record):
+    """플레이어 dict 하나를 (players 행, inventory 행들, goals 행들)로 나눕니다."""
+    missing = [key for key in KNOWN_KEYS if key not in record]
+    extra = {key: value for key, value in record.items() if key not in KNOWN_KEYS}
+    if missing:
+        extra[MISSING_KEY] = sorted(missing) # 원래 없던 키를 다시 읽을 때도 없게 유지
+    goal_info = record.get("daily_goal_info") or {}
+    row = [player_id]
+    for key, _, is_bool in COLUMNS:
+        value = record.get(key)
+        row.append(int(value) if is_bool and value is not None else value)
+    row += [goal_info.get("date"), goal_info.get("count"), json.dumps(extra, ensure_ascii=False) if extra else None]
+    inventory = [(player_id, slot, item) for slot, item in enumerate(record.get("inventory") or [])]
+    goals = [(player_id, slot, goal) for slot, goal in enumerate(record.get("goals") or [])]
+    return row, inventory, goals
+
+
+def rows_to_record(row, inventory, goals):
+    """record_to_rows의 역변환. 기존 JSON과 같은 모양의 dict를 돌려줍니다."""
+    extra = json.loads(row["extra"]) if row["extra"] else {}
+    missing = set(extra.pop(MISSING_KEY, ()))
+    record = {}
+    for key, column, is_bool in COLUMNS:
+        if key in missing: continue
+        value = row[column]
+        record[key] = bool(value) if is_bool and value is not None else value
+    if "inventory" not in missing: record["inventory"] = inventory
+    if "goals" not in missing: record["goals"] = goals
+    if "daily_goal_info" not in missing:
+        goal_info = {}
+        if row["goal_date"] is not None: goal_info["date"] = row["goal_date"]
+        if row["goal_count"] is not None: goal_info["count"] = row["goal_count"]
+        record["daily_goal_info"] = goal_info
+    record.update(extra)
+    return record
+
+
+class SqlitePlayerStore(PlayerStore):
+    """PlayerStore와 같은 인터페이스의 SQLite(WAL) 저장소.
+
+    조회는 똑같이 메모리에서 처리하고, 저장할 때는 바뀐 플레이어의 행만 UPSERT 합니다.
+    """
+
+    def __init__(self, path=DB_FILE, flush_interval=10.0):
+        super().__init__(path, flush_interval)
+        self._conn = None
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.executescript(SCHEMA)
+        return conn
+
+    def load(self):
+        if self._conn is None:
+            self._conn = self._connect()
+        inventories, goals = {}, {}
+        for r in self._conn.execute("SELECT player_id, item FROM inventory ORDER BY player_id, slot"):
+            inventories.setdefault(r["player_id"], []).append(r["item"])
+        for r in self._conn.execute("SELECT player_id, goal FROM goals ORDER BY player_id, slot"):
+            goals.setdefault(r["player_id"], []).append(r["goal"])
+        self._data = {
+            r["id"]: PlayerRecord.from_dict(rows_to_record(r, inventories.get(r["id"], []), goals.get(r["id"], [])))
+            for r in self._conn.execute("SELECT * FROM players")
+        }
+        self._dirty.clear()
+        self._build_indexes()
+        return self
+
+    def _write_rows(self, rows):
+        with self._conn:
+            ids = [(row[0],) for row, _, _ in rows]
+            self._conn.executemany(UPSERT_PLAYER, [row for row, _, _ in rows])
+            self._conn.executemany("DELETE FROM inventory WHERE player_id = ?", ids)
+            self._conn.executemany("DELETE FROM goals WHERE player_id = ?", ids)
+            self._conn.executemany("INSERT INTO inventory VALUES (?, ?, ?)", [i for _, inv, _ in rows for i in inv])
+            self._conn.executemany("INSERT INTO goals VALUES (?, ?, ?)", [g for _, _, gs in rows for g in gs])
+
+    def import_records(self, data):
+        """JSON 파일 전체를 한 번에 옮겨 담습니다. (마이그레이션 도구용, 동기 실행)"""
+        if self._conn is None:
+            self._conn = self._connect()
+        self._write_rows([record_to_rows(str(pid), record) for pid, record in data.items()])
+        return self.load()
+
+    async def flush(self):
+        async with self._write_lock:
+            if not self._dirty:
+                return False
+            dirty, self._dirty = self._dirty, set()
+            # 행 변환은 이벤트 루프에서(바뀐 플레이어만), 실제 쓰기는 스레드에서
+            rows = [record_to_rows(pid, self._data[pid]) for pid in dirty]
+            try:
+                await asyncio.to_thread(self._write_rows, rows)
+            except Exception:
+                self._dirty |= dirty
+                raise
+            return True
+
+    async def reset_daily(self, due_dates):
+        if not due_dates:
+            return []
+        async with self._write_lock:
+            reset_ids = self._reset_daily_in_memory(due_dates)
+            if reset_ids:
+                # 파일 전체를 다시 쓰지 않고 UPDATE 한 번으로 처리
+                await asyncio.to_thread(self._reset_daily_rows, list(due_dates.items()))
+            return reset_ids
+
+    def _reset_daily_rows(self, due_items):
+        values = ", ".join("(?, ?)" for _ in due_items)
+        params = [v for item in due_items for v in item]
+        with self._conn:
+            self._conn.execute(
+                f"WITH due(tz, today) AS (VALUES {values}) "
+                "UPDATE players SET challenge_registered_today = 0, challenge_type = NULL, "
+                "goal_count = CASE WHEN goal_date IS NULL AND goal_count IS NULL THEN NULL ELSE 0 END, "
+                "last_daily_reset_date = (SELECT today FROM due WHERE due.tz IS players.timezone) "
+                "WHERE registered = 1 AND EXISTS ("
+                "SELECT 1 FROM due WHERE due.tz IS players.timezone "
+                "AND (players.last_daily_reset_date IS NULL OR players.last_daily_reset_date < due.today))",
+                params,
+            )
+
+    async def close(self):
+        await super().close()
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
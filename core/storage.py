@@ -0,0 +1,493 @@
+# core/storage.py
+
+import asyncio
+import bisect
+import contextlib
+import copy
+import difflib
+import itertools
+import os
+import tempfile
+from datetime import datetime, timezone
+
+from core.codecs import detect_codec, get_codec
+from core.journal import apply_entry
+from core.player import PlayerRecord
+from core.schema import is_outdated, upgrade
+
+DATA_FILE = "player_data.json"
+
+
+def atomic_write_bytes(path, payload):
+    """임시 파일에 먼저 쓰고 fsync 한 뒤 rename 합니다.
+
+    중간에 프로세스가 죽어도 기존 파일은 그대로 남습니다. (이벤트 루프 밖의 스레드에서 호출)
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try: os.unlink(tmp_path)
+        except OSError: pass
+        raise
+    # rename 자체도 디스크에 남도록 디렉터리를 fsync (지원하지 않는 OS는 무시)
+    try:
+        dir_fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
+
+
+class DataFile:
+    """데이터 파일 하나에 대한 원자적 저장 담당.
+
+    직렬화와 저장은 워커 스레드에서 실행되고, 쓰는 도중 들어온 저장 요청들은
+    가장 마지막 데이터 하나로 합쳐져 한 번만 더 기록됩니다.
+    저장 형식은 codec(core.codecs)으로 정하고, 읽을 때는 파일 내용을 보고 형식을 자동으로 판별합니다.
+    """
+
+    def __init__(self, path, codec=None):
+        self.path = path
+        self.codec = codec or get_codec()
+        self._pending = None
+        self._writer = None
+
+    def load(self):
+        if not os.path.exists(self.path): return {}
+        with open(self.path, 'rb') as f: payload = f.read()
+        return detect_codec(payload).decode(payload) if payload.strip() else {}
+
+    def _write(self, data):
+        atomic_write_bytes(self.path, self.codec.encode(data))
+
+    async def save(self, data):
+        """data는 호출 이후 수정되지 않는 스냅샷이어야 합니다. (스레드에서 직렬화하므로)"""
+        self._pending = data
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.create_task(self._drain())
+        await asyncio.shield(self._writer)
+
+    async def _drain(self):
+        while self._pending is not None:
+            data, self._pending = self._pending, None
+            await asyncio.to_thread(self._write, data)
+
+
+class Transaction:
+    """store.transaction() 안에서 사용하는 변경 묶음.
+
+    변경 메서드는 바로 적용되지 않고 기록만 되었다가, 블록이 예외 없이 끝날 때
+    그 시점의 최신 데이터에 차례대로(변화량만) 적용됩니다.
+    적용 중 하나라도 실패하면(없는 아이템 remove 등) 아무것도 바뀌지 않고 기록되지도 않습니다.
+    """
+
+    def __init__(self, store, player_ids, actor=None):
+        self.store = store
+        self.player_ids = player_ids
+        self.actor = actor
+        self._ops = []
+
+    def get(self, player_id):
+        """잠금을 잡은 플레이어의 현재 데이터 (검증용으로 읽기만 할 것)"""
+        return self.store.get(self._check(player_id))
+
+    def _check(self, player_id):
+        player_id = str(player_id)
+        if player_id not in self.player_ids:
+            raise KeyError(f"{player_id}은(는) 이 트랜잭션에서 잠그지 않은 플레이어입니다.")
+        return player_id
+
+    def incr(self, player_id, key, amount, minimum=None):
+        self._ops.append(("incr", self._check(player_id), key, (amount, minimum)))
+
+    def set(self, player_id, key, value):
+        self._ops.append(("set", self._check(player_id), key, value))
+
+    def append(self, player_id, key, value):
+        self._ops.append(("append", self._check(player_id), key, value))
+
+    def remove(self, player_id, key, value):
+        self._ops.append(("remove", self._check(player_id), key, value))
+
+    def _commit(self):
+        # 먼저 (플레이어, 키)별 사본에 모두 적용해 보고, 끝까지 성공했을 때만 실제 데이터에 반영
+        staged, entries = {}, []
+        for op, player_id, key, value in self._ops:
+            if (player_id, key) not in staged:
+                current = self.store.get(player_id).get(key)
+                staged[player_id, key] = copy.deepcopy(current if current is not None or op == "set" else
+                                                       0 if op == "incr" else [])
+            if op == "incr":
+                amount, minimum = value
+                new_value = staged[player_id, key] + amount
+                staged[player_id, key] = new_value if minimum is None else max(minimum, new_value)
+            elif op == "set":
+                staged[player_id, key] = value
+            elif op == "append":
+                staged[player_id, key].append(value)
+            elif op == "remove":
+                staged[player_id, key].remove(value)
+            entry = {"op": op, "id": player_id, "key": key, "value": value[0] if op == "incr" else value,
+                     "result": copy.deepcopy(staged[player_id, key])}
+            if self.actor: entry["by"] = self.actor
+            entries.append(entry)
+        for (player_id, key), value in staged.items():
+            self.store.get(player_id)[key] = value
+        for entry in entries:
+            self.store._record_change(entry["id"], entry)
+
+
+_UNSET = object()
+
+
+def _reset_player_daily(player_data, today):
+    """마지막 초기화 날짜가 today보다 이전인 등록 플레이어만 초기화합니다."""
+    last_reset = player_data.last_daily_reset_date
+    if not player_data.registered or (last_reset is not None and last_reset >= today):
+        return False
+    player_data["challenge_registered_today"] = False
+    player_data["challenge_type"] = None
+    player_data["last_daily_reset_date"] = today
+    if player_data.daily_goal_info:
+        player_data.daily_goal_info["count"] = 0
+    return True
+
+
+def _now_str():
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+class PlayerStore:
+    """봇 전체가 공유하는 플레이어 데이터 저장소.
+
+    시작할 때 한 번만 파일을 읽고, 이후 조회는 메모리에서 처리합니다.
+    변경된 플레이어는 dirty로 표시해 두었다가 백그라운드 작업이 주기적으로 한 번에 저장합니다.
+
+    journal을 지정하면 저장할 때마다 파일 전체를 다시 쓰지 않고 변경 기록만 저널에 덧붙이며,
+    저널이 compact_bytes를 넘으면 스냅샷(player_data.json)을 새로 쓰고 저널을 비웁니다.
+
+    예전 구조의 데이터(core.schema)는 처음 조회될 때 최신 버전으로 올리고,
+    조회되지 않은 나머지는 백그라운드 작업이 조금씩 나눠서 올립니다.
+    """
+
+    def __init__(self, path=DATA_FILE, flush_interval=10.0, journal=None, compact_bytes=1024 * 1024, codec=None):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.journal = journal
+        self.compact_bytes = compact_bytes
+        self._file = DataFile(path, codec)
+        self._data = {}
+        # 마지막으로 저장된 상태의 사본. 스레드에서 직렬화하는 동안 명령어가 원본을 수정해도 안전하도록 분리
+        self._snapshot = {}
+        # _dirty: 스냅샷을 새로 복사해야 하는 플레이어 / _needs_put: 저널에 전체 데이터를 남겨야 하는 플레이어
+        self._dirty = set()
+        self._needs_put = set()
+        self._journal_entries = []
+        self._write_lock = asyncio.Lock()
+        self._flush_task = None
+        self._migrate_task = None
+        self._locks = {}
+        # 아직 최신 스키마로 올리지 않은 플레이어 ID
+        self._outdated = set()
+        # 이름 → 플레이어 ID 보조 인덱스 (이름이 겹칠 수 있으므로 set)
+        self._ids_by_name = {}
+        self._name_of = {}
+        self._sorted_names = None
+        # 시간대 값 → 플레이어 ID (일일 초기화를 시간대 단위로 처리하기 위한 버킷)
+        self._ids_by_tz = {}
+        self._tz_of = {}
+        # 플레이어의 시간대가 바뀌면 (플레이어 ID, 새 시간대 값)으로 호출됩니다. (DailyResetScheduler가 등록)
+        self.timezone_listeners = []
+
+    # --- 읽기 ---
+    def load(self):
+        data = self._file.load()
+        if self.journal:
+            # 마지막 스냅샷 이후의 변경 기록을 다시 적용
+            for entry in self.journal.read():
+                apply_entry(data, entry)
+        self._data = {pid: PlayerRecord.from_dict(record) for pid, record in data.items()}
+        self._snapshot = {pid: record.to_dict() for pid, record in self._data.items()}
+        self._dirty.clear()
+        self._needs_put.clear()
+        self._build_indexes()
+        return self
+
+    def _build_indexes(self):
+        self._rebuild_name_index()
+        self._ids_by_tz, self._tz_of = {}, {}
+        for player_id, record in self._data.items():
+            self._ids_by_tz.setdefault(record.timezone, set()).add(player_id)
+            self._tz_of[player_id] = record.timezone
+        self._outdated = {pid for pid, record in self._data.items() if is_outdated(record)}
+
+    def get(self, player_id):
+        player_id = str(player_id)
+        record = self._data.get(player_id)
+        if player_id in self._outdated:
+            self._upgrade(player_id)
+        return record
+
+    def __contains__(self, player_id):
+        return str(player_id) in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def items(self):
+        return self._data.items()
+
+    def find_by_name(self, name):
+        """정확히 같은 이름을 가진 플레이어 ID 목록 (동명이인이면 여러 개)"""
+        return sorted(self._ids_by_name.get(name, ()))
+
+    def search_names(self, query, limit=5):
+        """정확히 일치하는 이름이 없을 때 안내용 후보 이름을 찾습니다. (접두어 일치 우선, 없으면 유사한 이름)"""
+        if self._sorted_names is None:
+            self._sorted_names = sorted(self._ids_by_name)
+        names = self._sorted_names
+        matches = []
+        i = bisect.bisect_left(names, query)
+        while i < len(names) and names[i].startswith(query) and len(matches) < limit:
+            matches.append(names[i]); i += 1
+        return matches or difflib.get_close_matches(query, names, n=limit, cutoff=0.6)
+
+    def _reindex_name(self, player_id):
+        old_name = self._name_of.pop(player_id, None)
+        record = self._data.get(player_id)
+        new_name = record.get("name") if record else None
+        if old_name == new_name:
+            if new_name is not None: self._name_of[player_id] = new_name
+            return
+        if old_name is not None:
+            ids = self._ids_by_name.get(old_name)
+            if ids:
+                ids.discard(player_id)
+                if not ids: del self._ids_by_name[old_name]
+        if new_name is not None:
+            self._ids_by_name.setdefault(new_name, set()).add(player_id)
+            self._name_of[player_id] = new_name
+        self._sorted_names = None
+
+    def _reindex(self, player_id):
+        self._reindex_name(player_id)
+        self._reindex_timezone(player_id)
+
+    def _reindex_timezone(self, player_id):
+        record = self._data.get(player_id)
+        if record is None: return
+        old_tz, new_tz = self._tz_of.get(player_id, _UNSET), record.timezone
+        if old_tz == new_tz: return
+        if old_tz is not _UNSET:
+            ids = self._ids_by_tz[old_tz]
+            ids.discard(player_id)
+            if not ids: del self._ids_by_tz[old_tz]
+        self._ids_by_tz.setdefault(new_tz, set()).add(player_id)
+        self._tz_of[player_id] = new_tz
+        for listener in self.timezone_listeners:
+            listener(player_id, new_tz)
+
+    def _rebuild_name_index(self):
+        self._ids_by_name, self._name_of, self._sorted_names = {}, {}, None
+        for player_id in self._data:
+            self._reindex_name(player_id)
+
+    @property
+    def outdated_count(self):
+        """아직 최신 스키마로 올라가지 않은 플레이어 수"""
+        return len(self._outdated)
+
+    def timezones(self):
+        """플레이어들이 사용하는 시간대 값의 집합 (설정하지 않은 경우 None 포함)"""
+        return set(self._ids_by_tz)
+
+    # --- 쓰기 ---
+    def set(self, player_id, record):
+        """플레이어 데이터를 통째로 교체합니다. (등록, 리셋 등) dict를 넘기면 PlayerRecord로 바꿔 저장합니다."""
+        player_id = str(player_id)
+        if not isinstance(record, PlayerRecord):
+            record = PlayerRecord.from_dict(record)
+        self._data[player_id] = record
+        if is_outdated(record): self._outdated.add(player_id)
+        else: self._outdated.discard(player_id)
+        self._dirty.add(player_id)
+        if self.journal: self._needs_put.add(player_id)
+        self._reindex(player_id)
+
+    def mark_dirty(self, player_id):
+        """메모리의 데이터를 직접 수정한 뒤 호출하면 다음 저장 때 반영됩니다. (이름 인덱스도 갱신)"""
+        player_id = str(player_id)
+        if player_id in self._data:
+            self._dirty.add(player_id)
+            if self.journal: self._needs_put.add(player_id)
+            self._reindex(player_id)
+
+    def _upgrade(self, player_id):
+        self._outdated.discard(player_id)
+        if upgrade(self._data[player_id]):
+            self.mark_dirty(player_id)
+
+    def _record_change(self, player_id, entry):
+        """트랜잭션이 적용한 변화량 하나를 기록합니다. (저널에는 전체 데이터 대신 이 기록만 남음)"""
+        self._dirty.add(player_id)
+        if self.journal:
+            self._journal_entries.append({"at": _now_str(), **entry})
+        self._reindex(player_id)
+
+    def note(self, actor, text):
+        """데이터 변경 없이 관리 작업 기록만 저널에 남깁니다. (예: !수동초기화)"""
+        if self.journal:
+            self._journal_entries.append({"at": _now_str(), "op": "note", "by": actor, "text": text})
+
+    async def reset_daily(self, due_dates):
+        """일일 도전/목표 정보를 초기화합니다.
+
+        due_dates: {시간대 값: 그 시간대의 오늘 날짜 문자열}. 해당 시간대의 등록된 플레이어 중
+        아직 오늘 초기화되지 않은 플레이어만 초기화하고, 그 ID 목록을 반환합니다.
+        """
+        reset_ids = self._reset_daily_in_memory(due_dates)
+        for player_id in reset_ids:
+            self.mark_dirty(player_id)
+        return reset_ids
+
+    def _reset_daily_in_memory(self, due_dates):
+        reset_ids = []
+        # 전체를 훑지 않고 해당 시간대 버킷의 플레이어만 확인
+        for tz_value, today in due_dates.items():
+            for player_id in self._ids_by_tz.get(tz_value, ()):
+                if _reset_player_daily(self._data[player_id], today):
+                    reset_ids.append(player_id)
+        return reset_ids
+
+    def reset_player_daily(self, player_id, today):
+        """플레이어 한 명의 일일 정보를 today 기준으로 초기화합니다. (이미 초기화되어 있으면 False)"""
+        player_id = str(player_id)
+        player_data = self._data.get(player_id)
+        if player_data is None or not _reset_player_daily(player_data, today):
+            return False
+        self.mark_dirty(player_id)
+        return True
+
+    @contextlib.asynccontextmanager
+    async def transaction(self, *player_ids, actor=None):
+        """여러 플레이어를 안전하게 함께 수정합니다.
+
+            async with store.transaction(sender_id, receiver_id) as tx:
+                if item in tx.get(sender_id)["inventory"]:
+                    tx.remove(sender_id, "inventory", item); tx.append(receiver_id, "inventory", item)
+
+        플레이어별 잠금을 ID 순서대로 잡으므로(교착 방지) 서로 다른 플레이어의 명령어는 막지 않습니다.
+        확인 대기나 메시지 전송(ctx.send)처럼 오래 걸리는 작업은 블록 밖에서 해야 합니다. (답장은 블록 안에서 정하고 나와서 전송)
+        actor를 지정하면 저널에 누가 변경했는지 함께 기록됩니다. (관리자 명령어 감사용)
+        """
+        ids = sorted({str(player_id) for player_id in player_ids})
+        acquired = []
+        try:
+            for player_id in ids:
+                lock = self._locks.setdefault(player_id, asyncio.Lock())
+                await lock.acquire()
+                acquired.append(lock)
+            tx = Transaction(self, ids, actor)
+            yield tx
+            tx._commit()
+        finally:
+            for lock in reversed(acquired):
+                lock.release()
+
+    @property
+    def is_dirty(self):
+        return bool(self._dirty or self._journal_entries)
+
+    async def flush(self):
+        """변경사항이 있을 때만 저장합니다. 이벤트 루프에서는 바뀐 플레이어만 복사합니다."""
+        async with self._write_lock:
+            if not self.is_dirty:
+                return False
+            dirty, self._dirty = self._dirty, set()
+            puts, self._needs_put = self._needs_put, set()
+            entries, self._journal_entries = self._journal_entries, []
+            for player_id in dirty:
+                self._snapshot[player_id] = self._data[player_id].to_dict()
+            try:
+                if self.journal:
+                    now = _now_str()
+                    # put 기록은 실패해도 _needs_put에서 다시 만들어지므로 entries와 섞지 않음
+                    await self.journal.append(entries + [{"at": now, "op": "put", "id": pid, "value": self._snapshot[pid]} for pid in puts])
+                    if self.journal.size >= self.compact_bytes:
+                        await self._compact()
+                else:
+                    await self._file.save(dict(self._snapshot))
+            except Exception:
+                # 실패한 변경사항은 다음 저장 때 다시 시도
+                self._dirty |= dirty; self._needs_put |= puts
+                self._journal_entries[:0] = entries
+                raise
+            return True
+
+    async def export(self, codec):
+        """현재 모든 플레이어 데이터를 지정한 코덱으로 인코딩합니다. (관리자가 요청할 때만)"""
+        data = {player_id: record.to_dict() for player_id, record in self.items()}
+        return await asyncio.to_thread(codec.encode, data)
+
+    async def _compact(self):
+        """저널에 쌓인 변경을 스냅샷 파일 하나로 합치고 저널을 비웁니다."""
+        await self._file.save(dict(self._snapshot))
+        await self.journal.truncate()
+        print(f"플레이어 데이터 스냅샷 갱신 및 저널 정리 완료. ({len(self._snapshot)}명)")
+
+    # --- 백그라운드 저장 ---
+    def start(self):
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_loop())
+        self.start_migration()
+
+    def start_migration(self, batch_size=200, pause=0.5):
+        """최신 스키마가 아닌 플레이어를 백그라운드에서 batch_size명씩 나눠 올립니다. (이미 진행 중이면 무시)"""
+        if not self._outdated or (self._migrate_task and not self._migrate_task.done()):
+            return False
+        self._migrate_task = asyncio.create_task(self._migrate_loop(batch_size, pause))
+        return True
+
+    async def _migrate_loop(self, batch_size, pause):
+        upgraded = 0
+        while self._outdated:
+            batch = list(itertools.islice(self._outdated, batch_size))
+            for player_id in batch:
+                if player_id in self._data: self._upgrade(player_id)
+                else: self._outdated.discard(player_id)
+            upgraded += len(batch)
+            # 명령어 처리가 밀리지 않도록 배치 사이에 이벤트 루프를 양보
+            await asyncio.sleep(pause)
+        print(f"플레이어 데이터 스키마 업그레이드 완료. ({upgraded}명)")
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"❗️ 플레이어 데이터 저장 중 오류 발생: {e}")
+
+    async def close(self):
+        """종료 시 백그라운드 작업을 멈추고 남은 변경사항을 강제로 저장합니다."""
+        if self._migrate_task:
+            self._migrate_task.cancel()
+            self._migrate_task = None
+        if self._flush_task:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        await self.flush()
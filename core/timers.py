@@ -0,0 +1,122 @@
+# core/timers.py
+
+import asyncio
+import heapq
+import inspect
+import itertools
+
+
+class Timer:
+    """TimerService.schedule()이 돌려주는 핸들. reset()으로 마감을 미루고 cancel()로 취소합니다."""
+
+    __slots__ = ("service", "callback", "deadline", "cancelled", "fired", "_queued_at")
+
+    def __init__(self, service, callback, deadline):
+        self.service = service
+        self.callback = callback
+        self.deadline = deadline
+        self.cancelled = False
+        self.fired = False
+        self._queued_at = None  # 힙에 들어 있는 가장 이른 항목의 시각
+
+    def reset(self, delay):
+        """마감을 지금부터 delay초 뒤로 다시 잡습니다. (이미 실행/취소된 타이머도 다시 살아남)"""
+        self.cancelled = self.fired = False
+        self.deadline = self.service.loop_time() + delay
+        # 마감이 늦춰지기만 하면 힙은 건드리지 않음 (기존 항목이 꺼내질 때 새 마감으로 다시 넣음)
+        if self._queued_at is None or self.deadline < self._queued_at:
+            self.service._push(self)
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class TimerService:
+    """봇 전체가 함께 쓰는 타이머.
+
+    마감 시각을 최소 힙 하나에 모아 두고, 루프 하나가 가장 가까운 마감까지만 잠들었다가 만료된 타이머의
+    콜백을 실행합니다. 전투 턴 제한처럼 자주 미뤄지는 타이머도 작업(Task)을 새로 만들지 않고
+    Timer.reset()으로 마감 값만 바꿉니다.
+    """
+
+    def __init__(self):
+        self._heap = []  # (마감 시각, 순번, Timer)
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task = None
+
+    @staticmethod
+    def loop_time():
+        return asyncio.get_running_loop().time()
+
+    def schedule(self, delay, callback):
+        """delay초 뒤에 callback()을 호출합니다. 코루틴을 돌려주면 별도 작업으로 실행합니다."""
+        timer = Timer(self, callback, self.loop_time() + delay)
+        self._push(timer)
+        return timer
+
+    def _push(self, timer):
+        timer._queued_at = timer.deadline
+        heapq.heappush(self._heap, (timer.deadline, next(self._seq), timer))
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        elif self._heap[0][2] is timer:
+            self._wakeup.set() # 가장 이른 마감이 바뀌었으면 잠든 루프를 깨움
+
+    async def close(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            now = self.loop_time()
+            while self._heap and self._heap[0][0] <= now:
+                at, _, timer = heapq.heappop(self._heap)
+                if at != timer._queued_at:
+                    continue # 더 이른 항목으로 대체된 오래된 항목
+                timer._queued_at = None
+                if timer.cancelled:
+                    continue
+                if timer.deadline > now:
+                    self._push(timer) # 그 사이에 미뤄진 타이머
+                    continue
+                timer.fired = True
+                self._fire(timer)
+            timeout = self._heap[0][0] - now if self._heap else None
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def _fire(self, timer):
+        try:
+            result = timer.callback()
+            if inspect.isawaitable(result):
+                asyncio.create_task(self._guard(result))
+        except Exception as e:
+            print(f"❗️ 타이머 콜백 실행 중 오류 발생: {e}")
+
+    @staticmethod
+    async def _guard(coro):
+        try:
+            await coro
+        except Exception as e:
+            print(f"❗️ 타이머 콜백 실행 중 오류 발생: {e}")
+
+    async def wait_for(self, client, event, *, check=None, timeout):
+        """client.wait_for()와 같지만 제한 시간을 이 서비스의 타이머로 잽니다. (시간 초과 시 asyncio.TimeoutError)"""
+        waiter = asyncio.ensure_future(client.wait_for(event, check=check))
+        timer = self.schedule(timeout, waiter.cancel)
+        try:
+            return await waiter
+        except asyncio.CancelledError:
+            if timer.fired: raise asyncio.TimeoutError from None
+            raise
+        finally:
+            timer.cancel()
@@ -3,78 +3,102 @@ import discord
 from discord.ext import commands
 import asyncio
 import os
-from discord.ext import tasks
-from datetime import datetime, timezone,timedelta
-import pytz
-import json
+import config
 from config import DISCORD_TOKEN
+from core.clock import LocalClock
+from core.codecs import get_codec
+from core.conversations import Conversations
+from core.checkpoints import BattleCheckpoints
+from core.daily_reset import DailyResetScheduler
+from core.invitations import Invitations
+from core.journal import Journal
+from core.outbox import Outbox, OutboxContext
+from core.replay import REPLAY_LOG_FILE
+from core.storage import PlayerStore
+from core.sqlite_store import SqlitePlayerStore
+from core.timers import TimerService
 
-KST = timezone(timedelta(hours=9))
-intents = discord.Intents.default()
-intents.message_content = True
-bot = commands.Bot(command_prefix="!", intents=intents)
-bot.active_battles = {}
-
-
-
-def load_data():
-    if not os.path.exists("player_data.json"): return {}
-    with open("player_data.json", 'r', encoding='utf-8') as f: return json.load(f)
+PREFIX = "!"
+# 명령어를 받을 채널 ID 목록 (비어 있으면 모든 채널). 스레드는 상위 채널 ID로도 확인
+ALLOWED_CHANNELS = frozenset(getattr(config, "ALLOWED_CHANNELS", ()))
 
-def save_data(data):
-    with open("player_data.json", 'w', encoding='utf-8') as f: json.dump(data, f, indent=4, ensure_ascii=False)
+# Cog에 필요한 이벤트만 받음: 서버/채널 정보, 메시지(명령어, 대화 답), 서버 반응(대결 초대)
+# 멤버 목록은 받지 않음 (멘션한 멤버는 메시지에 함께 오므로 변환기가 그대로 사용)
+intents = discord.Intents.none()
+intents.guilds = True
+intents.guild_messages = True
+intents.dm_messages = True
+intents.message_content = True
+intents.guild_reactions = True
 
-# main.py
 
-# 일일 초기화 태스크 (유저 시간대별 오전 2시 기준)
-@tasks.loop(minutes=30) # 30분마다 모든 유저를 확인
-async def daily_reset_task():
-    all_data = load_data()
-    data_changed = False
+class Bot(commands.Bot):
+    async def get_context(self, origin, *, cls=OutboxContext):
+        # 명령어의 ctx.send()가 bot.outbox를 거치도록 OutboxContext를 사용
+        return await super().get_context(origin, cls=cls)
 
-    # 모든 등록된 유저를 한 명씩 확인
-    for player_id, player_data in all_data.items():
-        if not player_data.get("registered"):
-            continue
+    async def on_message(self, message):
+        # 대부분의 메시지는 일반 대화이므로 명령어 파싱 전에 최대한 빨리 버림
+        if message.author.bot or message.webhook_id: return
+        if ALLOWED_CHANNELS and message.guild and message.channel.id not in ALLOWED_CHANNELS \
+                and getattr(message.channel, "parent_id", None) not in ALLOWED_CHANNELS: return
+        # 답을 기다리는 대화가 있으면 그 대화로 바로 넘기고, 답으로 쓰인 메시지는 명령어로 처리하지 않음
+        if self.conversations.dispatch(message): return
+        if not message.content.startswith(PREFIX): return
+        await self.process_commands(message)
 
-        # 유저의 시간대 불러오기 (없으면 KST가 기본값)
-        user_tz_str = player_data.get("timezone", "Asia/Seoul")
-        try:
-            user_tz = pytz.timezone(user_tz_str)
-        except pytz.UnknownTimeZoneError:
-            user_tz = KST # 잘못된 값이면 KST로
-        
-        now_local = datetime.now(user_tz)
-        today_local_str = now_local.strftime('%Y-%m-%d')
-        last_reset_date = player_data.get("last_daily_reset_date")
+    async def on_raw_reaction_add(self, payload):
+        # 대결 초대 메시지에 대한 반응만 메시지 ID로 찾아 해당 초대에 전달
+        self.invitations.dispatch(payload)
 
-        # 현지 시간이 오전 2시가 지났고, 아직 오늘 초기화를 하지 않았다면 실행
-        if now_local.hour >= 2 and last_reset_date != today_local_str:
-            player_data["challenge_registered_today"] = False
-            player_data["challenge_type"] = None
-            player_data["last_daily_reset_date"] = today_local_str
-            
-            if "daily_goal_info" in player_data:
-                player_data["daily_goal_info"]["count"] = 0
 
-            data_changed = True
-            print(f"[{datetime.now(KST).strftime('%H:%M')}] 유저({player_data.get('name')})의 일일 정보 초기화 (시간대: {user_tz_str})")
+# 멤버 캐시와 메시지 캐시는 쓰지 않음 (반응은 on_raw_reaction_add로 메시지 ID만 보고 처리)
+bot = Bot(command_prefix=PREFIX, intents=intents, member_cache_flags=discord.MemberCacheFlags.none(),
+          max_messages=None, chunk_guilds_at_startup=False)
+bot.active_battles = {}
+# 전투 턴 제한, 응답 대기 시간 등 모든 제한 시간을 관리하는 공용 타이머 (루프 하나로 처리)
+bot.timers = TimerService()
+# 확인/입력을 기다리는 명령어의 대화 목록 ((채널, 사용자)마다 하나, 메시지를 키로 바로 전달)
+bot.conversations = Conversations(bot.timers)
+# 반응으로 수락을 받는 대결 초대 (메시지 ID → 초대) 와 초대 중인 채널
+bot.invitations = Invitations(bot.timers)
+# 모든 메시지 전송을 채널별 대기열로 모아 전송 한도에 맞춰 보냄 (명령어 응답 우선, 연속 메시지는 합침)
+bot.outbox = Outbox()
+# 스냅샷 형식: auto(orjson이 있으면 orjson, 없으면 compact json), json, orjson, msgpack, framed
+# 읽을 때는 형식을 자동으로 판별하므로 설정을 바꿔도 기존 파일을 그대로 읽을 수 있음
+# orjson, msgpack은 선택 의존성 (사용하려면 pip install orjson / pip install msgpack)
+codec = get_codec(getattr(config, "SNAPSHOT_CODEC", "auto"))
+# 모든 Cog가 공유하는 플레이어 데이터 저장소 (시작 시 한 번만 로드)
+# config.py에 STORAGE_BACKEND = "sqlite" 를 지정하면 SQLite 저장소를 사용
+if getattr(config, "STORAGE_BACKEND", "json") == "sqlite":
+    bot.store = SqlitePlayerStore(getattr(config, "SQLITE_PATH", "player_data.db"))
+else:
+    # 변경 기록만 저널에 덧붙이고, 저널이 커지면 player_data.json 스냅샷으로 합침
+    journal = Journal() if getattr(config, "PLAYER_JOURNAL", True) else None
+    bot.store = PlayerStore(journal=journal, codec=codec)
+# 진행 중인 전투를 행동마다 기록해 두고, 재시작하면 이어서 진행 (active_battles.json)
+bot.battle_checkpoints = BattleCheckpoints(codec=codec)
+# 끝난 전투의 시드와 행동 기록 (한 줄에 전투 하나, python -m tools.replay 로 재현)
+bot.battle_archive = Journal(REPLAY_LOG_FILE)
+# 플레이어 현지 시각/도전 가능 시간 계산 (시간대 객체와 하루 구간을 캐시)
+bot.clock = LocalClock()
+# 시간대별 오전 2시에 해당 시간대 플레이어만 일일 초기화
+# config.py에 DAILY_RESET_MODE = "lazy" 를 지정하면 백그라운드 작업 없이 명령어를 쓸 때 초기화
+bot.reset_scheduler = DailyResetScheduler(bot.store, bot.clock, lazy=getattr(config, "DAILY_RESET_MODE", "scheduler") == "lazy")
 
-    # 변경사항이 있었을 경우에만 파일 저장
-    if data_changed:
-        save_data(all_data)
-        print("일일 정보 초기화 및 데이터 저장 완료.")
 # on_ready 함수도 수정이 필요할 수 있습니다.
 @bot.event
 async def on_ready():
     print(f'{bot.user.name} 봇이 성공적으로 로그인했습니다!')
     print('------')
-    # 봇이 켜질 때, 루프가 즉시 시작되도록 보장
-    if not daily_reset_task.is_running():
-        daily_reset_task.start()
+    # 봇이 켜질 때 일일 초기화 스케줄러 시작 (이미 실행 중이면 무시)
+    bot.reset_scheduler.start()
 
 
 async def main():
+    bot.store.load()
+    bot.battle_checkpoints.load()
+    bot.store.start()
     async with bot:
         for filename in os.listdir('./cogs'):
             if filename.endswith('.py'):
@@ -83,7 +107,15 @@ async def main():
                     print(f'{filename} Cog가 로드되었습니다.')
                 except Exception as e:
                     print(f'❗️ {filename} Cog 로드 중 오류 발생: {e}')
-        await bot.start(DISCORD_TOKEN)
+        try:
+            await bot.start(DISCORD_TOKEN)
+        finally:
+            # 종료 시 아직 저장되지 않은 변경사항을 강제로 기록
+            await bot.reset_scheduler.close()
+            await bot.timers.close()
+            await bot.outbox.close()
+            await bot.battle_checkpoints.close()
+            await bot.store.close()
 
 if __name__ == '__main__':
     asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,2 @@
+# tools/__init__.py
+# 봇 실행과는 별개로 쓰는 관리/벤치마크 스크립트 (저장소 루트에서 python -m tools.<이름> 으로 실행)
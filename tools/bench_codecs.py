@@ -0,0 +1,46 @@
+# tools/bench_codecs.py
+"""스냅샷 코덱별 저장/불러오기 속도와 파일 크기를 비교합니다.
+
+사용법: python -m tools.bench_codecs [플레이어 수=20000]
+설치되지 않은 코덱(orjson, msgpack)은 건너뜁니다.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from core.codecs import CODECS, get_codec
+from core.storage import DataFile
+from tools.bench_store import make_players
+
+
+def best_of(rounds, fn):
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run(count, rounds=5):
+    data = make_players(count)
+    print(f"플레이어 {count}명 (각 {rounds}회 중 최솟값)\n")
+    print(f"{'codec':<8} {'size(KB)':>10} {'save(ms)':>10} {'load(ms)':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in CODECS:
+            try:
+                codec = get_codec(name)
+            except RuntimeError:
+                print(f"{name:<8} {'(설치되지 않음)':>10}")
+                continue
+            data_file = DataFile(os.path.join(tmp, f"player_data.{name}"), codec)
+            save_ms = best_of(rounds, lambda: data_file._write(data))
+            load_ms = best_of(rounds, data_file.load)
+            assert data_file.load() == data
+            print(f"{name:<8} {os.path.getsize(data_file.path) / 1024:>10.0f} {save_ms:>10.1f} {load_ms:>10.1f}")
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
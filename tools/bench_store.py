@@ -0,0 +1,83 @@
+# tools/bench_store.py
+"""저장 방식별 명령어 1회당 저장 비용을 비교합니다.
+
+사용법: python -m tools.bench_store [플레이어 수=10000]
+- legacy: 예전처럼 명령어마다 player_data.json 전체를 읽고 indent=4 로 다시 쓰기
+- json  : PlayerStore — 바뀐 플레이어만 표시하고 한 번에 저장 (명령어 1회 + 저장 1회 기준)
+- sqlite: SqlitePlayerStore — 바뀐 플레이어의 행만 UPSERT
+"""
+
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+from core.sqlite_store import SqlitePlayerStore
+from core.storage import PlayerStore
+
+
+def make_players(count):
+    rng = random.Random(0)
+    return {
+        str(10**17 + i): {
+            "mental": rng.randint(0, 40), "physical": rng.randint(0, 40),
+            "registered": True, "class": rng.choice(["마법사", "마검사", "검사"]), "name": f"플레이어{i}",
+            "emoji": "🐱", "color": "#FFAA00",
+            "challenge_type": None, "challenge_registered_today": False,
+            "rest_buff_active": False,
+            "school_points": rng.randint(0, 300), "inventory": rng.sample(["알사탕", "꽃송이", "인형", "홀케이크"], 2),
+            "goals": ["운동하기", "책읽기"], "daily_goal_info": {"date": "2024-01-01", "count": 1},
+            "today_blessing": None, "last_blessing_date": None,
+            "timezone": rng.choice([None, "Asia/Seoul", "America/New_York", "Europe/London"]),
+            "attribute": None, "last_daily_reset_date": "2024-01-01",
+        }
+        for i in range(count)
+    }
+
+
+def timed(label, rounds, fn):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    elapsed = (time.perf_counter() - start) / rounds
+    print(f"{label:<28} {elapsed * 1000:9.3f} ms")
+
+
+async def run(count, rounds=20):
+    data = make_players(count)
+    ids = list(data)
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "player_data.json")
+        with open(json_path, 'w', encoding='utf-8') as f: json.dump(data, f, indent=4, ensure_ascii=False)
+        print(f"플레이어 {count}명, player_data.json {os.path.getsize(json_path) / 1024:.0f} KB\n")
+
+        def legacy_command():
+            with open(json_path, 'r', encoding='utf-8') as f: all_data = json.load(f)
+            all_data[random.choice(ids)]["school_points"] += 1
+            with open(json_path, 'w', encoding='utf-8') as f: json.dump(all_data, f, indent=4, ensure_ascii=False)
+        timed("legacy load+save", rounds, legacy_command)
+
+        stores = [("json", PlayerStore(json_path).load()),
+                  ("sqlite", SqlitePlayerStore(os.path.join(tmp, "player_data.db")).import_records(data))]
+        for label, store in stores:
+            start = time.perf_counter()
+            for _ in range(rounds):
+                player_id = random.choice(ids)
+                store.get(player_id)["school_points"] += 1
+                store.mark_dirty(player_id)
+                await store.flush()
+            print(f"{label + ' command+flush':<28} {(time.perf_counter() - start) / rounds * 1000:9.3f} ms")
+
+        for label, store in stores:
+            start = time.perf_counter()
+            await store.reset_daily({tz: "2099-01-01" for tz in store.timezones()})
+            await store.flush()
+            print(f"{label + ' daily reset':<28} {(time.perf_counter() - start) * 1000:9.3f} ms")
+            await store.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(run(int(sys.argv[1]) if len(sys.argv) > 1 else 10000))
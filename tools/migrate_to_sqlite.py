@@ -0,0 +1,45 @@
+# tools/migrate_to_sqlite.py
+"""player_data.json 을 SQLite 저장소로 한 번에 옮깁니다.
+
+사용법: python -m tools.migrate_to_sqlite [player_data.json] [player_data.db] [player_data.journal]
+스냅샷 이후의 변경은 저널에만 있으므로, 봇과 같은 방식으로 저널까지 적용한 데이터를 옮깁니다.
+옮긴 뒤 config.py 에 STORAGE_BACKEND = "sqlite" 를 추가하면 봇이 SQLite 저장소를 사용합니다.
+"""
+
+import asyncio
+import copy
+import os
+import sys
+
+from core.journal import JOURNAL_FILE, Journal, apply_entry
+from core.player import PlayerRecord
+from core.schema import upgrade
+from core.sqlite_store import SqlitePlayerStore
+from core.storage import DataFile
+
+
+def _upgraded(record):
+    expected = PlayerRecord.from_dict(copy.deepcopy(record))
+    upgrade(expected)
+    return expected
+
+
+def migrate(json_path="player_data.json", db_path="player_data.db", journal_path=JOURNAL_FILE):
+    data = DataFile(json_path).load()
+    # 마지막 스냅샷 이후의 변경 기록을 다시 적용 (PlayerStore.load()와 같음)
+    entries = Journal(journal_path).read()
+    for entry in entries:
+        apply_entry(data, entry)
+    if os.path.exists(db_path):
+        raise SystemExit(f"❗️ {db_path} 파일이 이미 존재합니다. 덮어쓰지 않도록 먼저 옮기거나 삭제해주세요.")
+    store = SqlitePlayerStore(db_path).import_records(data)
+    # 옮긴 결과가 원본과 같은지 한 번 더 확인 (store.get()은 예전 구조를 최신으로 올려 주므로 원본도 똑같이 올려서 비교)
+    mismatched = [pid for pid, record in data.items() if store.get(pid) != _upgraded(record)]
+    asyncio.run(store.close())
+    if mismatched:
+        raise SystemExit(f"❗️ {len(mismatched)}명의 데이터가 원본과 다릅니다: {mismatched[:10]}")
+    print(f"✅ {len(data)}명의 플레이어 데이터를 {db_path}(으)로 옮겼습니다. (저널 기록 {len(entries)}개 포함)")
+
+
+if __name__ == '__main__':
+    migrate(*sys.argv[1:4])
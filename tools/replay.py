@@ -0,0 +1,71 @@
+# tools/replay.py
+"""끝난 전투를 시드와 행동 기록으로 다시 계산합니다. (디스코드 없이)
+
+사용법: python -m tools.replay <전투 기록 ID> [battle_log.jsonl]   한 전투를 행동별로 보여주기 (분쟁 확인용)
+        python -m tools.replay --verify [battle_log.jsonl]          모든 기록을 재계산해 결과가 바뀐 전투 찾기
+전투 기록 ID는 전투 종료 메시지 아래에 표시됩니다. --verify 는 규칙을 바꾼 뒤 회귀 확인에 씁니다.
+"""
+
+import json
+import sys
+import time
+
+from core.battle_engine import state_to_dict
+from core.journal import Journal
+from core.replay import REPLAY_LOG_FILE, ReplayLog, encode_action, replay
+
+
+def show(record):
+    print(f"전투 {record['id']} ({record['type']}, 종료 {record['ended']}, 시드 {record['seed']})")
+
+    def on_events(action, events):
+        prefix = f"{json.dumps(encode_action(action), ensure_ascii=False):<28}" if action else " " * 28
+        for event in events:
+            print(f"  {prefix} {event.kind:<9} {event.text}")
+            prefix = " " * 28
+
+    state, _ = replay(ReplayLog.from_dict(record), on_events)
+    print()
+    for fighter in state.fighters.values():
+        print(f"  {fighter.team}팀 {fighter.name:<10} HP {fighter.current_hp}/{fighter.max_hp}  위치 {fighter.pos + 1}")
+    print(f"\n재계산 결과: {state.winner}팀 승리 / 기록된 결과: {record['winner']}팀 승리"
+          + ("" if state.winner == record["winner"] else "  ❗️ 다름"))
+    print("최종 상태:", json.dumps(state_to_dict(state), ensure_ascii=False, separators=(',', ':')))
+
+
+def verify(records):
+    mismatched = []
+    start = time.perf_counter()
+    for record in records:
+        try:
+            state, _ = replay(ReplayLog.from_dict(record))
+            winner = state.winner
+        except Exception as e: # 규칙이 바뀌어 기록된 행동이 더 이상 허용되지 않는 경우 등
+            winner = f"오류: {e}"
+        if winner != record["winner"]:
+            mismatched.append((record["id"], record["winner"], winner))
+    elapsed = time.perf_counter() - start
+    print(f"전투 {len(records)}개 재계산, 전투당 평균 {elapsed / max(len(records), 1) * 1e6:.0f}µs")
+    for battle_id, recorded, replayed in mismatched:
+        print(f"  ❗️ {battle_id}: 기록 {recorded} → 재계산 {replayed}")
+    if mismatched:
+        raise SystemExit(f"결과가 다른 전투 {len(mismatched)}개")
+    print("✅ 모든 전투의 결과가 기록과 같습니다.")
+
+
+def main(args):
+    if not args:
+        raise SystemExit(__doc__)
+    verify_all = args[0] == "--verify"
+    path = args[1] if len(args) > 1 else REPLAY_LOG_FILE
+    records = Journal(path).read()
+    if verify_all:
+        return verify(records)
+    for record in records:
+        if record["id"] == args[0]:
+            return show(record)
+    raise SystemExit(f"❗️ {path}에서 전투 기록 '{args[0]}'을(를) 찾을 수 없습니다.")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
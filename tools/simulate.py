@@ -0,0 +1,234 @@
+# tools/simulate.py
+"""전투 밸런스 시뮬레이터. core.battle_engine 규칙으로 전투를 대량으로 돌려 통계를 냅니다.
+
+사용법: python -m tools.simulate [--battles 100000] [--mode 1v1|2v2] [--by class,attribute]
+                                [--bands 1-5,6-10,11-20] [--map 5x3] [--workers N] [--seed 0]
+                                [--set CRIT_CHANCE=0.15 --set HEART_HEAL_RATIO=0.25 ...]
+
+- 전투마다 레벨 구간 하나를 골라 모든 참가자를 그 구간에서 무작위로 만들고, 직업별 고정 전략으로 싸웁니다.
+- 레벨 구간별로 승률표(행이 열을 상대로 이긴 비율), 승부가 날 때까지의 평균 턴 수,
+  공격자 직업별 1회 피해량 분포를 출력합니다.
+- --set 으로 엔진의 밸런스 수치(CRIT_CHANCE, BUFF_MULTIPLIER, HEART_HEAL_RATIO 등)를 바꿔 비교할 수 있습니다.
+- 전투는 묶음 단위로 나눠 ProcessPoolExecutor의 모든 코어에서 실행합니다.
+"""
+
+import argparse
+import os
+import random
+import time
+import types
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from core import battle_engine as engine
+from core.battle_engine import (ActionError, Attack, Fighter, Move, Skill, Special,
+                                apply, new_battle, next_turn, targets_in_range, teleport_cells)
+from core.grid import Grid, parse_size
+
+CLASSES = ("마법사", "마검사", "검사")
+ATTRIBUTES = ("Gut", "Wit", "Heart")
+MAX_TURNS = 300       # 이 턴 수 안에 끝나지 않으면 무승부
+CHUNK_SIZE = 2000     # 작업 하나가 맡는 전투 수
+
+
+# --- 참가자 생성 ---
+def make_fighter(fighter_id, rng, band):
+    level = rng.randint(*band)
+    total = (level - 1) * 5 + rng.randint(0, 4)  # PlayerRecord.level = 1 + 총 스탯 // 5
+    mental = rng.randint(0, total)
+    player = types.SimpleNamespace(name=f"P{fighter_id}", emoji=str(fighter_id), player_class=rng.choice(CLASSES),
+                                   advanced_class=None, attribute=rng.choice(ATTRIBUTES), color_value=0,
+                                   level=level, mental=mental, physical=total - mental)
+    return Fighter.from_player(fighter_id, player)
+
+
+def label(fighter, by):
+    return "/".join(fighter.player_class if key == "class" else fighter.attribute for key in by)
+
+
+# --- 전략 ---
+def _paths(grid, pos, length):
+    """pos에서 length칸 이하로 갈 수 있는 (방향들, 도착 위치)"""
+    paths, frontier = [], [((), pos)]
+    for _ in range(length):
+        frontier = [(dirs + (d,), nxt) for dirs, p in frontier for d, nxt in grid.steps[p].items() if nxt is not None]
+        paths += frontier
+    return paths
+
+
+def _preferred_distance(fighter):
+    return 3 if fighter.player_class == "마법사" else 1
+
+
+def choose_action(state, actor):
+    """직업별 고정 전략: 회복이 필요하면 Heart 스킬, 사거리 안이면 강화 후 공격, 아니면 다가가기"""
+    distance = state.grid.distance[actor.pos]
+    in_range = targets_in_range(state, actor)
+    enemies = in_range or [state.fighters[pid] for pid in state.teams[state.enemy_team(actor.team)] if state.fighters[pid].alive]
+    target = min(enemies, key=lambda e: (e.current_hp if in_range else distance[e.pos], e.id))
+    ready = actor.special_cooldown == 0
+
+    if ready and actor.attribute == "Heart":
+        allies = [state.fighters[pid] for pid in state.teams[actor.team] if state.fighters[pid].alive]
+        if any(ally.current_hp * 2 <= ally.max_hp for ally in allies): return Skill(actor.id)
+    if in_range:
+        if ready and actor.player_class in ("마검사", "검사") and actor.attack_buff_stacks == 0: return Special(actor.id)
+        if ready and actor.attribute in ("Gut", "Wit"): return Skill(actor.id)
+        return Attack(actor.id, target.id)
+    want = _preferred_distance(actor)
+    to_target = state.grid.distance[target.pos]
+    if ready and actor.player_class == "마법사":
+        cells = teleport_cells(state, actor.id)
+        return Special(actor.id, min(cells, key=lambda c: abs(to_target[c] - want)))
+    mobility = 2 if actor.player_class == "검사" else 1
+    occupied = state.occupied_mask(actor.id)
+    paths = [(dirs, pos) for dirs, pos in _paths(state.grid, actor.pos, mobility) if not occupied >> pos & 1]
+    if not paths: return None
+    dirs, _ = min(paths, key=lambda p: (abs(to_target[p[1]] - want), len(p[0])))
+    return Move(actor.id, dirs)
+
+
+# --- 전투 실행 ---
+def play(state, rng, damage):
+    """한 전투를 끝까지 진행하고 (승리 팀 또는 None, 턴 수)를 반환합니다."""
+    for turn in range(1, MAX_TURNS + 1):
+        actor = state.current
+        while state.winner is None and state.actions_left > 0:
+            action = choose_action(state, actor)
+            if action is None: break
+            target = state.fighters[action.target] if isinstance(action, Attack) else None
+            hp_before = target.current_hp if target else 0
+            try:
+                events = apply(state, action, rng)
+            except ActionError:
+                break # 전략이 규칙에 맞지 않는 행동을 고르면 턴을 넘김
+            if target: damage[actor.player_class][hp_before - target.current_hp] += 1
+            if any(event.kind == "turn_over" for event in events): break
+        if state.winner is not None:
+            return state.winner, turn
+        next_turn(state)
+    return None, MAX_TURNS
+
+
+def run_chunk(seed, count, team_size, bands, by, size):
+    rng = random.Random(seed)
+    result = {"games": Counter(), "wins": Counter(), "draws": Counter(),
+              "turns": Counter(), "decided": Counter(), "damage": defaultdict(Counter)}
+    for _ in range(count):
+        band = rng.choice(bands)
+        team_a = [make_fighter(i, rng, band) for i in range(team_size)]
+        team_b = [make_fighter(team_size + i, rng, band) for i in range(team_size)]
+        labels = {team: "+".join(sorted(label(f, by) for f in fighters))
+                  for team, fighters in (("A", team_a), ("B", team_b))}
+        state, _ = new_battle(team_a, team_b, rng, Grid.get(*size))
+        winner, turns = play(state, rng, result["damage"])
+        a, b = labels["A"], labels["B"]
+        result["games"][band, a, b] += 1; result["games"][band, b, a] += 1
+        if winner is None:
+            result["draws"][band] += 1
+            continue
+        loser = state.enemy_team(winner)
+        result["wins"][band, labels[winner], labels[loser]] += 1
+        result["turns"][band] += turns; result["decided"][band] += 1
+    return result
+
+
+def _apply_overrides(overrides):
+    for name, value in overrides.items():
+        setattr(engine, name, value)
+
+
+def _parse_overrides(items):
+    overrides = {}
+    for item in items:
+        name, _, value = item.partition("=")
+        if not name.isupper() or not isinstance(getattr(engine, name, None), (int, float)):
+            raise SystemExit(f"❗️ 바꿀 수 없는 값입니다: {name} (core/battle_engine.py 의 수치 상수만 가능)")
+        overrides[name] = type(getattr(engine, name))(float(value))
+    return overrides
+
+
+# --- 결과 출력 ---
+def _percentile(counter, q):
+    target = q * (sum(counter.values()) - 1)
+    seen = 0
+    for value in sorted(counter):
+        seen += counter[value]
+        if seen > target: return value
+    return 0
+
+
+def report(result, bands, elapsed):
+    total = sum(result["games"].values()) // 2
+    print(f"전투 {total}회, {elapsed:.1f}초 ({total / max(elapsed, 1e-9):,.0f}회/초)\n")
+    for band in bands:
+        games = {(a, b): n for (bd, a, b), n in result["games"].items() if bd == band}
+        if not games: continue
+        names = sorted({a for a, _ in games})
+        width = max(8, *(len(n) for n in names)) + 2
+        decided = result["decided"][band]
+        print(f"[레벨 {band[0]}~{band[1]}] 평균 {result['turns'][band] / max(decided, 1):.1f}턴, "
+              f"무승부 {result['draws'][band]}회")
+        print(" " * width + "".join(f"{n:>{width}}" for n in names))
+        for row in names:
+            cells = []
+            for col in names:
+                n = games.get((row, col), 0)
+                cells.append(f"{result['wins'][band, row, col] / n:>{width}.1%}" if n else f"{'-':>{width}}")
+            print(f"{row:<{width}}" + "".join(cells))
+        print()
+    print("공격 1회 피해량 (직업별)")
+    print(f"{'직업':<6} {'횟수':>10} {'평균':>7} {'p10':>5} {'p50':>5} {'p90':>5} {'최대':>5}")
+    for player_class in CLASSES:
+        counter = result["damage"].get(player_class)
+        if not counter: continue
+        hits = sum(counter.values())
+        mean = sum(value * n for value, n in counter.items()) / hits
+        print(f"{player_class:<6} {hits:>10} {mean:>7.1f} {_percentile(counter, 0.1):>5} {_percentile(counter, 0.5):>5} "
+              f"{_percentile(counter, 0.9):>5} {max(counter):>5}")
+
+
+def merge(total, part):
+    for key in ("games", "wins", "draws", "turns", "decided"):
+        total[key].update(part[key])
+    for player_class, counter in part["damage"].items():
+        total["damage"][player_class].update(counter)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="전투 밸런스 시뮬레이터")
+    parser.add_argument("--battles", type=int, default=100000)
+    parser.add_argument("--mode", choices=("1v1", "2v2"), default="1v1")
+    parser.add_argument("--by", default="class", help="승률표 기준: class, attribute 또는 class,attribute")
+    parser.add_argument("--bands", default="1-5,6-10,11-20", help="레벨 구간 (쉼표로 구분)")
+    parser.add_argument("--map", default="5x3", help="맵 크기 (가로x세로)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--set", action="append", default=[], metavar="NAME=VALUE", help="엔진 밸런스 수치 변경")
+    args = parser.parse_args()
+
+    by = tuple(args.by.split(","))
+    if not set(by) <= {"class", "attribute"}: parser.error("--by 는 class, attribute 중에서 골라주세요.")
+    bands = [tuple(int(x) for x in band.split("-")) for band in args.bands.split(",")]
+    overrides = _parse_overrides(args.set)
+    team_size = 1 if args.mode == "1v1" else 2
+    try:
+        size = parse_size(args.map)
+    except ValueError as e:
+        parser.error(str(e))
+
+    chunks = [min(CHUNK_SIZE, args.battles - start) for start in range(0, args.battles, CHUNK_SIZE)]
+    seeds = [args.seed * 1_000_003 + i for i in range(len(chunks))]
+    total = {"games": Counter(), "wins": Counter(), "draws": Counter(),
+             "turns": Counter(), "decided": Counter(), "damage": defaultdict(Counter)}
+    start = time.perf_counter()
+    with ProcessPoolExecutor(args.workers, initializer=_apply_overrides, initargs=(overrides,)) as pool:
+        for part in pool.map(run_chunk, seeds, chunks, [team_size] * len(chunks),
+                             [bands] * len(chunks), [by] * len(chunks), [size] * len(chunks)):
+            merge(total, part)
+    if overrides: print("변경한 수치:", ", ".join(f"{k}={v}" for k, v in overrides.items()))
+    report(total, bands, time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    main()